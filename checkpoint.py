@@ -0,0 +1,65 @@
+"""Record the progress of a run to resume it after an interruption."""
+
+import json
+import os
+
+
+class Checkpoint:
+    """
+    Durable record of how much of the input file was processed.
+
+    It stores the offset in the input file after the last processed entry
+    and the size of the results file at that moment. Both files are
+    synced before the record is replaced, so after a crash the results
+    file can be cut at the recorded size and the run can go on from the
+    recorded input offset.
+    """
+
+    def __init__(self, checkpoint_file, input_file, result_file):
+        """Create the checkpoint of a run over the given files."""
+        self.checkpoint_file = checkpoint_file
+        self.input_file = os.path.abspath(input_file)
+        self.result_file = os.path.abspath(result_file)
+
+    def load(self):
+        """
+        Get the input offset and the results size of the last checkpoint.
+
+        Return (0, 0) if there is no checkpoint to resume.
+        """
+        if not os.path.isfile(self.checkpoint_file):
+            return 0, 0
+
+        with open(self.checkpoint_file) as file:
+            record = json.load(file)
+
+        if record['input_file'] != self.input_file or \
+                record['result_file'] != self.result_file:
+            raise Exception(
+                'Checkpoint "%s" belongs to another run (%s to %s).' % (
+                    self.checkpoint_file,
+                    record['input_file'],
+                    record['result_file']
+                )
+            )
+        return record['input_offset'], record['output_offset']
+
+    def save(self, input_offset, output_offset):
+        """Replace the checkpoint atomically."""
+        record = {
+            'input_file': self.input_file,
+            'result_file': self.result_file,
+            'input_offset': input_offset,
+            'output_offset': output_offset,
+        }
+        temporary_file = self.checkpoint_file + '.tmp'
+        with open(temporary_file, 'w') as file:
+            json.dump(record, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_file, self.checkpoint_file)
+
+    def remove(self):
+        """Remove the checkpoint, once the run is complete."""
+        if os.path.isfile(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
@@ -0,0 +1,50 @@
+"""Turn the compact truth tables of a results file back to text."""
+
+import argparse
+import sys
+
+from lp.interpreter import TruthTable
+
+
+def decode_line(line):
+    """Replace the compact tables of a result line by their text."""
+    return TruthTable.compact_pattern.sub(
+        lambda matches: TruthTable.decode_compact_representation(
+            matches.group(0)
+        ),
+        line
+    )
+
+
+def main(args=None):
+    """Run the decoder with the command line arguments."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        'input_file',
+        help='the results file with compact tables, or - for the '
+             'standard input'
+    )
+    arg_parser.add_argument(
+        'result_file', nargs='?', default='-',
+        help='the file to write the decoded results, or - for the '
+             'standard output'
+    )
+    args = arg_parser.parse_args(args)
+
+    input_file = sys.stdin if args.input_file == '-' \
+        else open(args.input_file)
+    result_file = sys.stdout if args.result_file == '-' \
+        else open(args.result_file, 'w')
+
+    try:
+        for line in input_file:
+            result_file.write(decode_line(line))
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if result_file is not sys.stdout:
+            result_file.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,76 @@
 """Delegates the operation to the respective class."""
 
+import signal
+
 import operations
+from lp.engines import EngineSelector, Statistics, TableEngine
+from lp.engines import ResourceLimitExceeded, TimeLimitExceeded
+
+
+class Limits:
+    """
+    The time (in seconds) and memory (in bytes) limits of the lines.
+
+    The limits given on creation hold for all operations, and can be
+    replaced for a given operation:
+
+        >>> limits = Limits(time_limit=10, memory_budget=2**30)
+        >>> limits.set('EQ', time_limit=1)
+        >>> limits.get('EQ')
+        {'time_limit': 1, 'memory_budget': 1073741824}
+    """
+
+    def __init__(self, time_limit=None, memory_budget=None):
+        """Set the limits of all operations."""
+        self.limits = {
+            None: {'time_limit': time_limit, 'memory_budget': memory_budget}
+        }
+
+    def set(self, operation, **limits):
+        """Set the limits of an operation, or of all of them if None."""
+        self.limits.setdefault(operation, {}).update(limits)
+
+    def get(self, operation):
+        """Get the limits of an operation."""
+        limits = dict(self.limits[None])
+        limits.update(self.limits.get(operation, {}))
+        return limits
+
+
+class TimeLimit:
+    """
+    Interrupt the code run inside it after a wall-clock time limit.
+
+    It raises TimeLimitExceeded from a timer signal, so it only works in
+    the main thread of platforms with signal.setitimer.
+    """
+
+    def __init__(self, seconds):
+        """Set the time limit, None for no limit."""
+        self.seconds = seconds
+        self.previous_handler = None
+
+    def __enter__(self):
+        """Start the timer."""
+        if self.seconds and hasattr(signal, 'setitimer'):
+            self.previous_handler = signal.signal(
+                signal.SIGALRM, self.interrupt
+            )
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, *exception):
+        """Stop the timer."""
+        if self.previous_handler is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous_handler)
+            self.previous_handler = None
+
+    def interrupt(self, signal_number, frame):
+        """Interrupt the running code."""
+        raise TimeLimitExceeded(
+            'Time limit of %g seconds exceeded.' % self.seconds
+        )
 
 
 class OperationHandler:
@@ -11,10 +81,64 @@ class OperationHandler:
         operations.SemanticEquivalence.SYMBOL: operations.SemanticEquivalence,
         operations.Consistency.SYMBOL: operations.Consistency,
         operations.LogicConsequence.SYMBOL: operations.LogicConsequence,
+        operations.ModelCount.SYMBOL: operations.ModelCount,
+        operations.EquivalenceClasses.SYMBOL: operations.EquivalenceClasses,
+        operations.KnowledgeBaseDeclaration.SYMBOL:
+            operations.KnowledgeBaseDeclaration,
+    }
+
+    # Operations that declare something to be used by the next lines
+    DECLARATIONS = {
+        operations.KnowledgeBaseDeclaration.SYMBOL,
     }
 
     @classmethod
-    def handle(cls, line):
+    def is_declaration(cls, line):
+        """Check if the line declares something for the next lines."""
+        return line.split(',')[0] in cls.DECLARATIONS
+
+    # What to do with the lines over the limits
+    SKIP = 'skip'
+    MARK = 'mark'
+    RETRY = 'retry'
+
+    @classmethod
+    def handle_within_limits(cls, line, limits=None, on_limit=SKIP,
+                             metrics=None, **options):
+        """
+        Handle the line within the limits of its operation.
+
+        When the line is over the limits, on_limit tells what to do:
+            'skip': raise ResourceLimitExceeded;
+            'mark': return the mark of the exceeded limit, like
+                    '[TEMPO_ESGOTADO]';
+            'retry': handle the line again giving only the verdict,
+                     which is cheaper, and mark it if it still fails.
+        The line is counted in the metrics, if any, when it is over the
+        limits.
+        """
+        line_limits = limits.get(line.split(',')[0]) if limits else {}
+        try:
+            return cls.handle(line, **dict(options, **line_limits))
+        except ResourceLimitExceeded as error:
+            if metrics is not None:
+                metrics.over_limits += 1
+            if on_limit == cls.SKIP:
+                raise
+            exceeded = error
+
+        if on_limit == cls.RETRY and options.get('full_table', True):
+            options = dict(options, full_table=False, **line_limits)
+            try:
+                return cls.handle(line, **options)
+            except ResourceLimitExceeded as error:
+                exceeded = error
+
+        return '[%s]' % exceeded.MARK
+
+    @classmethod
+    def handle(cls, line, memory_budget=None, time_limit=None, report=None,
+               **options):
         """
         Handle the given line by parsing the operation in first param.
 
@@ -22,6 +146,18 @@ class OperationHandler:
             line (str):
                 A comma separated string containing the
                 operation and its params
+            memory_budget:
+                The memory in bytes the evaluation may use, lines
+                that do not fit raise ResourceLimitExceeded
+            time_limit:
+                The seconds the evaluation may take, lines that
+                take longer raise TimeLimitExceeded
+            report:
+                A dict to report the symbols of the line and the truth
+                table rows evaluated for it (see fill_report)
+            options:
+                The output options given to the operation,
+                like full_table=False to get only the verdict
 
         Examples:
 
@@ -33,8 +169,84 @@ class OperationHandler:
         requested_operation = line.split(',')[0]
         if requested_operation in cls.OPERATIONS:
             # Call the respective operation with the given params
-            operation = cls.OPERATIONS[requested_operation]()
+            operation = cls.OPERATIONS[requested_operation](**options)
             args = operation.parse(line)
-            return operation.perform(*args)
+            estimate = None
+            try:
+                with TimeLimit(time_limit):
+                    estimate = cls.select_engine(
+                        operation, args, memory_budget
+                    )
+                    result = operation.perform(*args)
+            except MemoryError:
+                exceeded = ResourceLimitExceeded('Out of memory.')
+            except ResourceLimitExceeded as error:
+                exceeded = error
+            else:
+                cls.fill_report(report, operation, args, estimate, True)
+                return result
+            operation.reject(exceeded, *args)
+            cls.fill_report(report, operation, args, estimate, False)
+            raise exceeded
         else:
-            raise Exception('Invalid operation "%s"' % operation)
+            raise Exception('Invalid operation "%s"' % requested_operation)
+
+    @classmethod
+    def select_engine(cls, operation, args, memory_budget=None):
+        """
+        Choose the cheapest way to evaluate the operation formulas.
+
+        The truth tables are built unless only the verdict is requested
+        and another engine is cheaper, or the operation evaluates the
+        formulas with its own engines. The lines with an early result
+        (see Operation.get_early_result) evaluate no engine, so they are
+        admitted without an estimate.
+        Return the estimate of the chosen engine, if it was chosen here.
+        """
+        if operation.get_early_result(*args) is not None:
+            return None
+
+        expressions = operation.get_expressions(*args)
+        if expressions is None or operation.engine is not None:
+            return None
+
+        estimate = EngineSelector.select(
+            expressions,
+            full_table=operation.full_table,
+            table_format=operation.table_format,
+            checks=operation.CHECKS,
+            memory_budget=memory_budget,
+            engines=operation.get_engines(*args)
+        )
+        if estimate.engine is not TableEngine:
+            operation.engine = estimate.engine()
+        return estimate
+
+    @classmethod
+    def fill_report(cls, report, operation, args, estimate, evaluated):
+        """
+        Report the symbols of the line and the truth table rows evaluated.
+
+        The rows are the ones of the engine chosen for the line, when it
+        evaluated them to the end. The lines with an early result, the
+        lines decided by search and the lines over the limits evaluate no
+        rows.
+        """
+        if report is None:
+            return
+
+        if estimate is not None:
+            report['symbols'] = estimate.symbols
+        else:
+            try:
+                expressions = operation.get_expressions(*args)
+            except ResourceLimitExceeded:
+                # The knowledge base referenced is over the limits
+                expressions = None
+            report['symbols'] = None if expressions is None else \
+                Statistics(expressions).symbols
+
+        report['rows'] = 0
+        if evaluated and estimate is not None and \
+                estimate.engine.EVALUATES_ROWS:
+            report['rows'] = estimate.rows
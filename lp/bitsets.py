@@ -0,0 +1,81 @@
+"""Provide means to handle columns of truth values as bitsets."""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Translate the bytes 0 and 1 to the digits '0' and '1', and back
+TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def full(size):
+    """Get the bitset with size bits set."""
+    return (1 << size) - 1
+
+
+def pack(values):
+    """Pack a sequence of truth values in a bitset (first value in bit 0)."""
+    digits = bytes(map(bool, values))[::-1].translate(TO_DIGITS)
+    return int(digits, 2) if digits else 0
+
+
+def unpack(bitset, size):
+    """Unpack a bitset in a list of size truth values."""
+    if not size:
+        return []
+    digits = format(bitset, '0%db' % size).encode('ascii')
+    return list(map(bool, digits[::-1].translate(FROM_DIGITS)))
+
+
+def is_array(values):
+    """Check if the values are a NumPy array."""
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def repeat(bitset, width, quantity):
+    """Repeat a bitset of width bits quantity times (a power of 2)."""
+    while quantity > 1:
+        bitset |= bitset << width
+        width *= 2
+        quantity //= 2
+    return bitset
+
+
+def symbol_column(index, quantity):
+    """
+    Get the column of a symbol in a truth table of quantity symbols.
+
+    The lines of the table follow the TruthTable order: the symbol at
+    index is True in the first half of each block of 2**(quantity - index)
+    lines, so the first line has all symbols True.
+    """
+    block = 2**(quantity - index - 1)
+    return repeat(full(block), 2 * block, 2**index)
+
+
+def symbol_columns(symbols):
+    """Get the columns of all the symbols of a truth table."""
+    return {
+        symbol: symbol_column(index, len(symbols))
+        for index, symbol in enumerate(symbols)
+    }
+
+
+def get_models(formulas, symbols):
+    """
+    Get the lines of the truth table of the symbols where all the parsed
+    formulas are true.
+
+    Return the models, the symbols columns and the mask of the table.
+    """
+    columns = symbol_columns(symbols)
+    mask = full(2**len(symbols))
+    models = mask
+    for formula in formulas:
+        if not models:
+            break
+        models &= formula.evaluate_columns(columns, mask)
+    return models, columns, mask
@@ -0,0 +1,258 @@
+"""Provide means to count the models of formulas without enumerating them."""
+
+import sys
+
+from lp.syntax import PropositionalSymbol
+from lp.syntax import Negation, Conjunction, Disjunction
+from lp.syntax import Implication, BiImplication
+
+
+class ClauseSet:
+    """
+    Clausal form of a set of formulas (Tseitin encoding).
+
+    Each propositional symbol and each binary subformula is a variable
+    (a positive integer) and a literal is a signed variable. The variables
+    created for the subformulas are defined by clauses, so every valuation
+    of the symbols extends to exactly one model of the clauses and the
+    number of models is preserved.
+    """
+
+    def __init__(self, formulas):
+        """Encode the given parsed formulas."""
+        self.symbols = {}
+        self.clauses = []
+        self.variables_quantity = 0
+        self.definitions = {}
+
+        symbols = []
+        for formula in formulas:
+            symbols.extend(
+                f.str_representation() for f in formula.subformulas()
+                if f.is_a(PropositionalSymbol)
+            )
+        # Symbols are numbered first, in lexicographic order
+        for symbol in sorted(set(symbols)):
+            self.symbols[symbol] = self.new_variable()
+
+        for formula in formulas:
+            self.clauses.append(frozenset([self.encode(formula)]))
+
+    def new_variable(self):
+        """Create a new variable."""
+        self.variables_quantity += 1
+        return self.variables_quantity
+
+    def encode(self, formula):
+        """Get the literal that represents the formula, defining it."""
+        if formula.is_a(PropositionalSymbol):
+            return self.symbols[formula.str_representation()]
+
+        if formula.is_a(Negation):
+            return -self.encode(formula.arg1)
+
+        formula_repr = formula.str_representation()
+        if formula_repr in self.definitions:
+            return self.definitions[formula_repr]
+
+        a = self.encode(formula.arg1)
+        b = self.encode(formula.arg2)
+        x = self.new_variable()
+
+        if formula.is_a(Conjunction):
+            clauses = [(-x, a), (-x, b), (x, -a, -b)]
+        elif formula.is_a(Disjunction):
+            clauses = [(-x, a, b), (x, -a), (x, -b)]
+        elif formula.is_a(Implication):
+            clauses = [(-x, -a, b), (x, a), (x, -b)]
+        elif formula.is_a(BiImplication):
+            clauses = [(-x, -a, b), (-x, a, -b), (x, a, b), (x, -a, -b)]
+        else:
+            raise Exception('Invalid formula "%s".' % formula_repr)
+
+        self.clauses.extend(frozenset(clause) for clause in clauses)
+        self.definitions[formula_repr] = x
+        return x
+
+    def variables(self):
+        """Get all the variables of the encoding."""
+        return frozenset(range(1, self.variables_quantity + 1))
+
+
+class ModelCounter:
+    """
+    Count models with a DPLL search with component caching.
+
+    The clauses left after an assignment are split into components that
+    share no variables, so their counts are multiplied instead of searched
+    together, and the count of each component is cached by its clauses.
+    """
+
+    def __init__(self):
+        """Create a counter with an empty cache."""
+        self.cache = {}
+
+    def count(self, formulas, symbols=()):
+        """
+        Count the valuations that satisfy all the parsed formulas.
+
+        The valuations are over the symbols of the formulas plus the
+        given extra symbols.
+        """
+        clause_set = ClauseSet(formulas)
+        extra_symbols = set(symbols) - set(clause_set.symbols)
+
+        # Tautological clauses are satisfied by every valuation
+        clauses = [clause for clause in clause_set.clauses
+                   if not self.is_tautological(clause)]
+
+        # The search goes one level deeper for each branched variable
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(
+            max(recursion_limit, 3 * clause_set.variables_quantity + 1000)
+        )
+        try:
+            result = self.count_clauses(clauses, clause_set.variables())
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        return result * 2**len(extra_symbols)
+
+    def count_clauses(self, clauses, variables):
+        """Count the assignments to variables that satisfy the clauses."""
+        if clauses is None:
+            return 0
+
+        clauses, assigned = self.propagate(clauses)
+        if clauses is None:
+            return 0
+
+        occurring = set()
+        for clause in clauses:
+            occurring.update(abs(literal) for literal in clause)
+
+        # Variables absent from every clause can take any value
+        result = 2**len(variables - assigned - occurring)
+        for component in self.get_components(clauses):
+            key = frozenset(component)
+            if key not in self.cache:
+                self.cache[key] = self.count_component(component)
+            result *= self.cache[key]
+            if result == 0:
+                break
+        return result
+
+    def count_component(self, clauses):
+        """Count the models of a component by branching on a variable."""
+        occurrences = {}
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = \
+                    occurrences.get(abs(literal), 0) + 1
+        variable = max(occurrences, key=occurrences.get)
+        variables = frozenset(occurrences) - {variable}
+
+        return sum(
+            self.count_clauses(self.assign(clauses, {literal}), variables)
+            for literal in (variable, -variable)
+        )
+
+    @classmethod
+    def propagate(cls, clauses):
+        """
+        Assign the literals of unit clauses until there are none left.
+
+        Return the remaining clauses and the assigned variables,
+        or None as clauses if a conflict is found.
+        """
+        occurrences = {}
+        for index, clause in enumerate(clauses):
+            for literal in clause:
+                occurrences.setdefault(abs(literal), []).append(index)
+
+        values = {}
+        units = [next(iter(clause)) for clause in clauses
+                 if len(clause) == 1]
+        while units:
+            literal = units.pop()
+            if values.get(abs(literal)) is (literal < 0):
+                return None, set(values)
+            if abs(literal) in values:
+                continue
+            values[abs(literal)] = literal > 0
+
+            for index in occurrences[abs(literal)]:
+                unassigned = []
+                for other in clauses[index]:
+                    value = values.get(abs(other))
+                    if value is None:
+                        unassigned.append(other)
+                    elif value is (other > 0):
+                        # The clause is satisfied
+                        break
+                else:
+                    if not unassigned:
+                        return None, set(values)
+                    if len(unassigned) == 1:
+                        units.append(unassigned[0])
+
+        if not values:
+            return clauses, set()
+
+        true_literals = set(
+            variable if value else -variable
+            for variable, value in values.items()
+        )
+        return cls.assign(clauses, true_literals), set(values)
+
+    @classmethod
+    def assign(cls, clauses, literals):
+        """
+        Simplify the clauses assuming the literals are true.
+
+        Return None if a clause becomes false.
+        """
+        if any(-literal in literals for literal in literals):
+            return None
+
+        falsified = set(-literal for literal in literals)
+        result = []
+        for clause in clauses:
+            if not literals.isdisjoint(clause):
+                continue
+            if not falsified.isdisjoint(clause):
+                clause = clause - falsified
+                if not clause:
+                    return None
+            result.append(clause)
+        return result
+
+    @classmethod
+    def get_components(cls, clauses):
+        """Split the clauses in groups that share no variables."""
+        parent = {}
+
+        def find(variable):
+            while parent[variable] != variable:
+                parent[variable] = parent[parent[variable]]
+                variable = parent[variable]
+            return variable
+
+        for clause in clauses:
+            variables = [abs(literal) for literal in clause]
+            for variable in variables:
+                parent.setdefault(variable, variable)
+            root = find(variables[0])
+            for variable in variables[1:]:
+                parent[find(variable)] = root
+
+        components = {}
+        for clause in clauses:
+            root = find(abs(next(iter(clause))))
+            components.setdefault(root, []).append(clause)
+        return list(components.values())
+
+    @classmethod
+    def is_tautological(cls, clause):
+        """Check if a clause contains a literal and its negation."""
+        return any(-literal in clause for literal in clause)
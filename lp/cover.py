@@ -0,0 +1,84 @@
+"""Provide means to describe sets of models by cubes."""
+
+from lp import bitsets
+
+
+class CubeCover:
+    """
+    Cover of a set of models by cubes, computed over truth table columns.
+
+    A cube is a partial valuation, like {'p': True, 'r': False}, that
+    stands for all the valuations of the other symbols. The cover is the
+    irredundant sum of products of Minato and Morreale: every cube is a
+    prime implicant of the models and no cube can be removed, so it is
+    usually orders of magnitude smaller than the list of the models.
+    """
+
+    def __init__(self, symbols):
+        """Prepare the columns of the truth table of the symbols."""
+        self.symbols = list(symbols)
+        self.columns = [
+            bitsets.symbol_column(index, len(self.symbols))
+            for index in range(len(self.symbols))
+        ]
+        self.mask = bitsets.full(2**len(self.symbols))
+
+    def get_cubes(self, models):
+        """
+        Get the cubes of the models, a bitset over the table lines.
+
+        The symbols of each cube are in the order of the table symbols.
+        """
+        cubes, _ = self.cover(models, models, 0)
+        return cubes
+
+    def cover(self, lower, upper, index):
+        """
+        Get cubes covering lower but no valuation outside upper.
+
+        Only the symbols from index on are split on, the previous ones are
+        already fixed by the caller. Return the cubes and their bitset.
+        """
+        if not lower:
+            return [], 0
+        if upper == self.mask:
+            return [{}], self.mask
+
+        # The first symbol the bounds depend on
+        while True:
+            lower0, lower1 = self.get_cofactors(lower, index)
+            upper0, upper1 = self.get_cofactors(upper, index)
+            if lower0 != lower1 or upper0 != upper1:
+                break
+            index += 1
+
+        symbol = self.symbols[index]
+        column = self.columns[index]
+
+        # Cubes needing the symbol False, then True, then neither
+        cubes0, covered0 = self.cover(lower0 & ~upper1, upper0, index + 1)
+        cubes1, covered1 = self.cover(lower1 & ~upper0, upper1, index + 1)
+        cubes, covered = self.cover(
+            (lower0 & ~covered0) | (lower1 & ~covered1),
+            upper0 & upper1,
+            index + 1
+        )
+
+        cubes = [dict({symbol: True}, **cube) for cube in cubes1] + \
+            [dict({symbol: False}, **cube) for cube in cubes0] + cubes
+        covered |= (covered1 & column) | (covered0 & ~column & self.mask)
+        return cubes, covered
+
+    def get_cofactors(self, bitset, index):
+        """
+        Get the bitset with the symbol at index False and True.
+
+        Both cofactors are spread over the whole table, as bitsets that
+        do not depend on the symbol.
+        """
+        column = self.columns[index]
+        width = 2**(len(self.symbols) - index - 1)
+        true_lines = bitset & column
+        false_lines = bitset & ~column & self.mask
+        return (false_lines | false_lines >> width,
+                true_lines | true_lines << width)
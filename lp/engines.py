@@ -0,0 +1,243 @@
+"""Provide means to choose how the formulas are evaluated."""
+
+from lp.interpreter import Interpreter, Formula
+from lp.counting import ModelCounter
+from lp.simplifier import Simplifier
+from lp import bitsets
+
+
+class ResourceLimitExceeded(Exception):
+    """Raised when no engine can evaluate the formulas within the limits."""
+
+    # Result of a line marked as over the limits
+    MARK = 'MEMORIA_ESGOTADA'
+
+
+class TimeLimitExceeded(ResourceLimitExceeded):
+    """Raised when the evaluation takes longer than its time limit."""
+
+    MARK = 'TEMPO_ESGOTADO'
+
+
+def scale(quantity, unit_cost):
+    """Multiply a quantity by its unit cost, too large costs are infinite."""
+    try:
+        return quantity * unit_cost
+    except OverflowError:
+        return float('inf')
+
+
+class Statistics:
+    """Describe the size of a set of formulas."""
+
+    def __init__(self, expressions):
+        """Parse the formulas and count their symbols and subformulas."""
+        symbols = set()
+        subformulas = set()
+        self.terms = 0
+        for expression in expressions:
+            formula = Interpreter.parse_expression(expression)
+            formula_subformulas, prop_symbols = \
+                Formula(formula).get_subformulas()
+            symbols.update(s.str_representation() for s in prop_symbols)
+            subformulas.update(
+                f.str_representation() for f in formula_subformulas
+            )
+            self.terms += formula.count_terms()
+
+        self.symbols = len(symbols)
+        self.subformulas = len(subformulas)
+        self.rows = 2**self.symbols
+        self.cells = self.rows * (self.symbols + self.subformulas)
+
+
+class Estimate:
+    """The predicted cost of evaluating formulas with an engine."""
+
+    def __init__(self, engine, statistics, memory, time):
+        """Store the predictions, memory in bytes and time in seconds."""
+        self.engine = engine
+        self.symbols = statistics.symbols
+        self.rows = statistics.rows
+        self.cells = statistics.cells
+        self.memory = memory
+        self.time = time
+
+    def __str__(self):
+        """Return the estimate as str."""
+        return '%s: %d rows, %d cells, %d bytes, %.3g s' % (
+            self.engine.NAME, self.rows, self.cells, self.memory, self.time
+        )
+
+
+class Engine:
+    """
+    Base class for the evaluation engines.
+
+    An engine decides if a set of parsed formulas is satisfiable, which
+    is enough to get the verdict of every operation.
+    """
+
+    NAME = None
+    # If the engine evaluates the formulas in each row of the table
+    EVALUATES_ROWS = True
+
+    @classmethod
+    def estimate(cls, statistics, output_size, checks):
+        """
+        Predict the cost of the evaluation.
+
+        The output_size is the size in bytes of the requested table text
+        and checks is the number of satisfiability checks needed.
+        """
+        raise NotImplementedError
+
+    def is_satisfiable(self, formulas):
+        """Check if the formulas have a model in common."""
+        raise NotImplementedError
+
+    @classmethod
+    def simplify(cls, formulas):
+        """Simplify the formulas to evaluate less subformulas."""
+        return [Simplifier.simplify(formula) for formula in formulas]
+
+
+class TableEngine(Engine):
+    """
+    Evaluate the formulas by building their truth table.
+
+    It is the only engine able to output the table, the verdicts are
+    computed by the operations themselves.
+    """
+
+    NAME = 'table'
+
+    # Measured costs of a table cell
+    CELL_MEMORY = 72
+    CELL_TIME = 2e-6
+    CELL_OUTPUT_TIME = 3e-7
+
+    @classmethod
+    def estimate(cls, statistics, output_size, checks):
+        """Predict the cost of building and writing the table."""
+        memory = statistics.cells * cls.CELL_MEMORY + 2 * output_size
+        # Each cell gets the values of all symbols of its line
+        time = scale(
+            statistics.cells,
+            cls.CELL_TIME * max(statistics.symbols, 1) + cls.CELL_OUTPUT_TIME
+        )
+        return Estimate(cls, statistics, memory, time)
+
+
+class BitsetEngine(Engine):
+    """Evaluate the formulas column by column, over bitsets."""
+
+    NAME = 'bitset'
+
+    # Measured cost of an operator over a byte of the columns
+    BYTE_TIME = 3e-10
+
+    @classmethod
+    def estimate(cls, statistics, output_size, checks):
+        """Predict the cost of evaluating one bitset per subformula."""
+        column_size = statistics.rows // 8 + 1
+        memory = (statistics.symbols + statistics.subformulas) * column_size
+        time = scale(
+            column_size,
+            checks * (statistics.symbols + statistics.terms) * cls.BYTE_TIME
+        )
+        return Estimate(cls, statistics, memory, time)
+
+    def is_satisfiable(self, formulas):
+        """Check if the conjunction of the formulas columns is not empty."""
+        formulas = self.simplify(formulas)
+        models, _, _ = bitsets.get_models(
+            formulas, Formula.get_symbols(formulas)
+        )
+        return models != 0
+
+
+class CountingEngine(Engine):
+    """Search for a model with the DPLL model counter."""
+
+    NAME = 'counting'
+    EVALUATES_ROWS = False
+
+    # Rough costs of a clause in each step of the search
+    CLAUSE_MEMORY = 200
+    CLAUSE_TIME = 1e-6
+
+    @classmethod
+    def estimate(cls, statistics, output_size, checks):
+        """
+        Predict the cost of the search.
+
+        The time is a rough guess: the search is assumed to branch on a
+        quarter of the symbols, the remaining ones being propagated.
+        """
+        clauses = 4 * statistics.terms
+        memory = clauses * cls.CLAUSE_MEMORY * (statistics.symbols + 1)
+        time = scale(
+            2**(statistics.symbols // 4),
+            checks * clauses * cls.CLAUSE_TIME
+        )
+        return Estimate(cls, statistics, memory, time)
+
+    def is_satisfiable(self, formulas):
+        """Check if the formulas have at least one model."""
+        return ModelCounter().count(self.simplify(formulas)) > 0
+
+
+class EngineSelector:
+    """Choose the cheapest engine that fits in the memory budget."""
+
+    ENGINES = [TableEngine, BitsetEngine, CountingEngine]
+
+    # Output bytes of each table cell, by table format
+    CELL_OUTPUT_SIZE = {'text': 2, 'hex': 1 / 4, 'base64': 1 / 6}
+
+    @classmethod
+    def estimate(cls, expressions, full_table=True, table_format='text',
+                 checks=1, engines=None):
+        """
+        Get the estimates of the engines able to give the output, or of
+        the given engines.
+        """
+        statistics = Statistics(expressions)
+        output_size = 0
+        if full_table:
+            output_size = int(
+                statistics.cells * cls.CELL_OUTPUT_SIZE[table_format]
+            )
+
+        if engines is None:
+            engines = cls.ENGINES if not full_table else [TableEngine]
+        return [
+            engine.estimate(statistics, output_size, checks)
+            for engine in engines
+        ]
+
+    @classmethod
+    def select(cls, expressions, full_table=True, table_format='text',
+               checks=1, memory_budget=None, engines=None):
+        """
+        Get the estimate of the engine with the lowest time within the
+        memory budget.
+
+        Raise ResourceLimitExceeded if none of them fits in the budget.
+        """
+        estimates = cls.estimate(expressions, full_table, table_format,
+                                 checks, engines)
+        admitted = [
+            estimate for estimate in estimates
+            if memory_budget is None or estimate.memory <= memory_budget
+        ]
+        if not admitted:
+            raise ResourceLimitExceeded(
+                'Memory budget of %d bytes exceeded (%s).' % (
+                    memory_budget,
+                    '; '.join(str(estimate) for estimate in estimates)
+                )
+            )
+
+        return min(admitted, key=lambda estimate: estimate.time)
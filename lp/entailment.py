@@ -0,0 +1,129 @@
+"""Provide means to reuse the verdicts of sets of formulas."""
+
+from lp.interpreter import Interpreter
+from lp.simplifier import Simplifier
+from lp.syntax import Conjunction
+
+
+class EntailmentCache:
+    """
+    Known consistent and inconsistent sets of formulas.
+
+    The verdicts carry over by monotonicity: the subsets of a consistent
+    set are consistent and the supersets of an inconsistent set are
+    inconsistent. As a set entails a formula when the set plus the
+    negation of the formula is inconsistent, it also answers the logic
+    consequences: an inconsistent set entails every formula and an
+    entailment of a set holds for its supersets.
+
+    A set is stored by the simplified representations of its formulas,
+    split on their conjunctions (see lp.simplifier), and every formula
+    indexes the stored sets that have it, so the subsets and supersets
+    are looked up over the sets that share formulas with the query only.
+    """
+
+    # Sets stored of each kind, at most
+    MAX_SETS = 100000
+
+    def __init__(self, max_sets=MAX_SETS):
+        """Create an empty cache."""
+        self.max_sets = max_sets
+        self.formulas = {}
+        # The sets of each kind and the indexes of their sets by formula
+        self.consistent = []
+        self.consistent_index = {}
+        self.inconsistent = []
+        self.inconsistent_index = {}
+
+    def is_consistent(self, expressions):
+        """
+        Get if the formulas are consistent, when it follows from the
+        stored sets.
+
+        Return None if it is not known.
+        """
+        key = self.get_key(expressions)
+        if self.has_subset(key, self.inconsistent, self.inconsistent_index):
+            return False
+        if self.has_superset(key, self.consistent_index):
+            return True
+        return None
+
+    def store(self, expressions, consistent):
+        """Store if the formulas are consistent."""
+        key = self.get_key(expressions, add=True)
+        if consistent:
+            self.add(key, self.consistent, self.consistent_index)
+        else:
+            self.add(key, self.inconsistent, self.inconsistent_index)
+
+    def get_key(self, expressions, add=False):
+        """
+        Get the set of the formulas numbers.
+
+        The numbers of new formulas are given only if add is True, else
+        they are left out of the key.
+        """
+        key = set()
+        for expression in expressions:
+            formula = Simplifier.simplify(
+                Interpreter.parse_expression(expression)
+            )
+            for operand in Simplifier.get_operands(formula, Conjunction):
+                formula_repr = operand.str_representation()
+                if formula_repr not in self.formulas:
+                    if not add:
+                        # No stored set has it
+                        key.add(None)
+                        continue
+                    self.formulas[formula_repr] = len(self.formulas)
+                key.add(self.formulas[formula_repr])
+        return frozenset(key)
+
+    def add(self, key, sets, index):
+        """
+        Add a set of formulas numbers to the sets and their index.
+
+        The set is added before it is indexed, so if a time limit
+        interrupts the index update, the index has no position without
+        its set.
+        """
+        if len(sets) >= self.max_sets:
+            return
+        sets.append(key)
+        position = len(sets) - 1
+        for number in key:
+            index.setdefault(number, set()).add(position)
+
+    @classmethod
+    def has_subset(cls, key, sets, index):
+        """Check if one of the indexed sets is a subset of the key."""
+        if not key:
+            return False
+        # Count the formulas of each indexed set that are in the key
+        found = {}
+        for number in key:
+            for position in index.get(number, ()):
+                found[position] = found.get(position, 0) + 1
+                if found[position] == len(sets[position]):
+                    return True
+        return False
+
+    @classmethod
+    def has_superset(cls, key, index):
+        """Check if one of the indexed sets is a superset of the key."""
+        if not key:
+            # The empty set is consistent
+            return True
+        if None in key:
+            return False
+
+        positions = sorted(
+            (index.get(number, set()) for number in key), key=len
+        )
+        candidates = set(positions[0])
+        for other_positions in positions[1:]:
+            if not candidates:
+                break
+            candidates &= other_positions
+        return bool(candidates)
@@ -0,0 +1,331 @@
+"""Provide means to decide Horn and 2-CNF formulas in linear time."""
+
+from lp.interpreter import Interpreter
+from lp.syntax import PropositionalSymbol
+from lp.syntax import Negation, Conjunction, Disjunction
+from lp.syntax import Implication, BiImplication
+
+
+class ClausalForm:
+    """
+    Clauses read directly off formulas already written as clauses.
+
+    Like in lp.counting.ClauseSet, each propositional symbol is a variable
+    (a positive integer) and a literal is a signed variable, but no
+    variables are created for the subformulas. So only these formulas
+    are accepted, as conjunctions of them:
+
+        * literals, like p or -p;
+        * disjunctions of literals, like -p | q | r;
+        * implications from a conjunction of literals, like p & q -> r;
+        * bi-implications between literals, like p <-> -q;
+        * negations of conjunctions or disjunctions of literals.
+
+    The clauses attribute is None if some formula is not accepted, and
+    the fragment attribute is the one of the clauses (see get_fragment).
+    """
+
+    HORN = 'horn'
+    TWO_CNF = '2-cnf'
+
+    def __init__(self, formulas):
+        """Read the clauses of the given parsed formulas."""
+        self.symbols = {}
+        self.clauses = []
+        for formula in formulas:
+            clauses = self.get_clauses(formula)
+            if clauses is None:
+                self.clauses = None
+                break
+            self.clauses.extend(
+                clause for clause in clauses
+                if not self.is_tautological(clause)
+            )
+        self.fragment = self.get_fragment()
+
+    def get_fragment(self):
+        """
+        Get the fragment the clauses belong to, HORN or TWO_CNF.
+
+        Horn clauses have at most one positive literal and 2-CNF ones
+        at most two literals. Return None if they are in neither.
+        """
+        if self.clauses is None:
+            return None
+        if all(sum(1 for literal in clause if literal > 0) <= 1
+               for clause in self.clauses):
+            return self.HORN
+        if all(len(clause) <= 2 for clause in self.clauses):
+            return self.TWO_CNF
+        return None
+
+    def is_satisfiable(self, units=()):
+        """
+        Check if the clauses plus the given unit literals have a model.
+
+        Unit clauses keep the fragment, so it is decided in linear time.
+        Return None if the clauses are not in a known fragment.
+        """
+        if self.fragment is None:
+            return None
+        clauses = self.clauses + [frozenset([unit]) for unit in units]
+        if self.fragment == self.HORN:
+            return is_horn_satisfiable(clauses)
+        if self.fragment == self.TWO_CNF:
+            return is_two_cnf_satisfiable(clauses)
+        return None
+
+    def get_clauses(self, formula):
+        """Get the clauses of a formula, or None if it is not accepted."""
+        clauses = []
+        for operand in get_operands(formula, Conjunction):
+            if operand.is_a(Implication):
+                body = self.get_literals(operand.arg1, Conjunction)
+                head = self.get_clauses(operand.arg2)
+                if body is None or head is None:
+                    return None
+                negated_body = [-literal for literal in body]
+                clauses.extend(clause | frozenset(negated_body)
+                               for clause in head)
+
+            elif operand.is_a(BiImplication):
+                a = self.get_literal(operand.arg1)
+                b = self.get_literal(operand.arg2)
+                if a is None or b is None:
+                    return None
+                clauses.extend([frozenset([-a, b]), frozenset([a, -b])])
+
+            elif operand.is_a(Negation) and \
+                    operand.arg1.is_a(Conjunction):
+                literals = self.get_literals(operand.arg1, Conjunction)
+                if literals is None:
+                    return None
+                clauses.append(frozenset(-literal for literal in literals))
+
+            elif operand.is_a(Negation) and \
+                    operand.arg1.is_a(Disjunction):
+                literals = self.get_literals(operand.arg1, Disjunction)
+                if literals is None:
+                    return None
+                clauses.extend(frozenset([-literal]) for literal in literals)
+
+            else:
+                literals = self.get_literals(operand, Disjunction)
+                if literals is None:
+                    return None
+                clauses.append(frozenset(literals))
+
+        return clauses
+
+    def get_literals(self, formula, operator):
+        """Get the literals of a chain of the operator, or None."""
+        literals = []
+        for operand in get_operands(formula, operator):
+            literal = self.get_literal(operand)
+            if literal is None:
+                return None
+            literals.append(literal)
+        return literals
+
+    def get_literal(self, formula):
+        """Get the literal of a formula, or None if it is not a literal."""
+        if formula.is_a(PropositionalSymbol):
+            symbol = formula.str_representation()
+            if symbol not in self.symbols:
+                self.symbols[symbol] = len(self.symbols) + 1
+            return self.symbols[symbol]
+
+        if formula.is_a(Negation):
+            literal = self.get_literal(formula.arg1)
+            return -literal if literal is not None else None
+
+        return None
+
+    @classmethod
+    def is_tautological(cls, clause):
+        """Check if a clause has a literal and its negation."""
+        return any(-literal in clause for literal in clause)
+
+
+class FragmentSolver:
+    """
+    Decide satisfiability and entailment for Horn and 2-CNF formulas.
+
+    Horn clauses are decided by unit propagation and 2-CNF clauses by the
+    strongly connected components of their implication graph, both in
+    linear time on the size of the clauses, instead of on the 2^n lines
+    of the truth table.
+    """
+
+    @classmethod
+    def is_satisfiable(cls, expressions):
+        """
+        Check if the formulas have a model in common.
+
+        Return None if they are not all Horn or all 2-CNF clauses.
+        """
+        clausal_form = ClausalForm([
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ])
+        return clausal_form.is_satisfiable()
+
+    @classmethod
+    def entails(cls, premises, conclusion):
+        """
+        Check if the conclusion is logic consequence of the premises.
+
+        The conclusion follows if no clause of it can be false along with
+        the premises, that is, if the premises plus the negation of each
+        of its clauses (a set of unit clauses) have no model.
+        Return None if the premises are not all Horn or all 2-CNF clauses
+        or if the conclusion is not accepted by ClausalForm.
+        """
+        clausal_form = ClausalForm([
+            Interpreter.parse_expression(premise) for premise in premises
+        ])
+        if clausal_form.fragment is None:
+            return None
+
+        conclusion_clauses = clausal_form.get_clauses(
+            Interpreter.parse_expression(conclusion)
+        )
+        if conclusion_clauses is None:
+            return None
+
+        for clause in conclusion_clauses:
+            if ClausalForm.is_tautological(clause):
+                continue
+            if clausal_form.is_satisfiable(-literal for literal in clause):
+                return False
+        return True
+
+
+def get_operands(formula, operator):
+    """
+    Flatten a chain of the given operator into its operands, in order.
+
+    It does not recurse, so long chains of clauses can be read.
+    """
+    operands = []
+    stack = [formula]
+    while stack:
+        formula = stack.pop()
+        if formula.is_a(operator):
+            stack.append(formula.arg2)
+            stack.append(formula.arg1)
+        else:
+            operands.append(formula)
+    return operands
+
+
+def is_horn_satisfiable(clauses):
+    """
+    Check if Horn clauses have a model, by unit propagation.
+
+    The variables are made true only when a clause forces them, each
+    clause counting its negative literals not yet made true. A clause
+    without a positive literal whose count reaches zero is false.
+    """
+    remaining = []
+    heads = []
+    watchers = {}
+    forced = []
+    for index, clause in enumerate(clauses):
+        body = [-literal for literal in clause if literal < 0]
+        head = [literal for literal in clause if literal > 0]
+        heads.append(head[0] if head else None)
+        remaining.append(len(body))
+        for variable in body:
+            watchers.setdefault(variable, []).append(index)
+        if not body:
+            if not head:
+                return False
+            forced.append(head[0])
+
+    true_variables = set()
+    while forced:
+        variable = forced.pop()
+        if variable in true_variables:
+            continue
+        true_variables.add(variable)
+        for index in watchers.get(variable, ()):
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                if heads[index] is None:
+                    return False
+                forced.append(heads[index])
+    return True
+
+
+def is_two_cnf_satisfiable(clauses):
+    """
+    Check if 2-CNF clauses have a model, by their implication graph.
+
+    Each clause a | b gives the edges -a -> b and -b -> a (a unit clause
+    a is a | a), and the clauses have no model if and only if a literal
+    and its negation are in the same strongly connected component.
+    """
+    graph = {}
+    for clause in clauses:
+        if not clause:
+            return False
+        literals = list(clause)
+        a, b = literals[0], literals[-1]
+        graph.setdefault(-a, []).append(b)
+        graph.setdefault(-b, []).append(a)
+
+    components = get_components(graph)
+    return all(
+        components[literal] != components.get(-literal)
+        for literal in components
+    )
+
+
+def get_components(graph):
+    """
+    Get the strongly connected component of each node of a graph.
+
+    It is the Tarjan's algorithm, with an explicit stack instead of
+    recursion. Return a dict from the nodes to their component number.
+    """
+    index = {}
+    low = {}
+    components = {}
+    components_quantity = 0
+    stack = []
+    on_stack = set()
+
+    def visit(node):
+        index[node] = low[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+        return node, iter(graph.get(node, ()))
+
+    for start in graph:
+        if start in index:
+            continue
+
+        path = [visit(start)]
+        while path:
+            node, successors = path[-1]
+            for successor in successors:
+                if successor not in index:
+                    path.append(visit(successor))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                path.pop()
+                if path:
+                    parent = path[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    components_quantity += 1
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        components[member] = components_quantity
+                        if member == node:
+                            break
+    return components
@@ -1,10 +1,19 @@
 """Provide means to interpret formulas."""
 
+import base64
+import hashlib
+import re
+
 from lp.syntax import PropositionalSymbol, PontuationSymbol
 from lp.syntax import Negation, Conjunction, Disjunction
 from lp.syntax import Implication, BiImplication
 from lp.syntax import OpeningParenthesis, ClosingParenthesis
 from lp.syntax import UnaryOperator, BinaryOperator, Operator
+from lp.syntax import Composable
+from lp.simplifier import Simplifier
+from lp.counting import ModelCounter
+from lp.cover import CubeCover
+from lp import bitsets
 
 
 class Scanner:
@@ -146,7 +155,12 @@ class Interpreter:
 
         This method is an implementatin of the
         Djikstra's Shunting-yard algorithm.
+        A formula already built (like Var('p') >> Var('q'), see
+        lp.syntax.Composable) is returned as is, without being scanned.
         """
+        if isinstance(expression, Composable):
+            return expression
+
         scanner = Scanner(expression)
 
         output_queue = []
@@ -251,6 +265,126 @@ class Formula:
         subformulas = self.formula.subformulas()
         return Formula.filter_repeated_formulas(subformulas)
 
+    def evaluate_batch(self, values, symbols=None):
+        """
+        Evaluate the formula over many valuations in one call.
+
+        The values can be a dict with a sequence of truth values for each
+        propositional symbol, or a 2-D NumPy boolean array with one line
+        per valuation and one column per symbol in the symbols list.
+
+        The operators are evaluated column by column, over bitsets (or
+        over NumPy arrays, when the values are arrays).
+        Return the list of the formula values, or an array for NumPy input.
+
+        Examples:
+
+            >>> formula = Formula(Interpreter.parse_expression('p->q'))
+            >>> formula.evaluate_batch({'p': [1, 1, 0], 'q': [1, 0, 0]})
+            [True, False, True]
+        """
+        if bitsets.is_array(values):
+            if symbols is None:
+                raise Exception('The symbols of the array columns are needed.')
+            values = {
+                symbol: values[:, index]
+                for index, symbol in enumerate(symbols)
+            }
+
+        if values and all(bitsets.is_array(v) for v in values.values()):
+            arrays = {
+                symbol: bitsets.numpy.asarray(column, dtype=bool)
+                for symbol, column in values.items()
+            }
+            return self.formula.evaluate_columns(arrays, True)
+
+        sizes = set(len(column) for column in values.values())
+        if len(sizes) > 1:
+            raise Exception('The columns of values have different sizes.')
+        size = sizes.pop() if sizes else 0
+
+        columns = {
+            symbol: bitsets.pack(column)
+            for symbol, column in values.items()
+        }
+        result = self.formula.evaluate_columns(columns, bitsets.full(size))
+        return bitsets.unpack(result, size)
+
+    def count_models(self):
+        """Count the valuations of the formula symbols that are models."""
+        return ModelCounter().count([self.formula])
+
+    @classmethod
+    def count_set_models(cls, expressions):
+        """
+        Count the models of a set of formulas without building its table.
+
+        Each expression can be a string or a parsed formula.
+        """
+        formulas = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+        return ModelCounter().count(formulas)
+
+    @classmethod
+    def get_equivalence_classes(cls, expressions):
+        """
+        Partition formulas in classes of semantically equivalent formulas.
+
+        Each formula gets a fingerprint: the hash of its column in the
+        truth table of all the symbols, computed as a bitset. Equivalent
+        formulas have the same column, so the formulas are grouped by
+        fingerprint without comparing them pairwise.
+        Return the lists of the given expressions, in order of appearance.
+        """
+        formulas = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+
+        symbols = cls.get_symbols(formulas)
+        columns = bitsets.symbol_columns(symbols)
+        size = 2**len(symbols)
+        mask = bitsets.full(size)
+
+        classes = {}
+        for expression, formula in zip(expressions, formulas):
+            column = formula.evaluate_columns(columns, mask)
+            fingerprint = hashlib.blake2b(
+                column.to_bytes((size + 7) // 8, 'little'), digest_size=16
+            ).digest()
+            classes.setdefault(fingerprint, []).append(expression)
+        return list(classes.values())
+
+    @classmethod
+    def get_models_cover(cls, expressions):
+        """
+        Get the models of a set of formulas as a cover of cubes.
+
+        Each cube is a partial valuation like {'p': True, 'r': False},
+        which stands for all the valuations of the other symbols (see
+        lp.cover.CubeCover). The models are computed as a bitset over
+        the truth table of the symbols, without building the table.
+        """
+        formulas = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+
+        symbols = cls.get_symbols(formulas)
+        models, _, _ = bitsets.get_models(formulas, symbols)
+        return CubeCover(symbols).get_cubes(models)
+
+    @classmethod
+    def get_symbols(cls, formulas):
+        """Get the propositional symbols of the parsed formulas, ordered."""
+        symbols = set()
+        for formula in formulas:
+            _, prop_symbols = Formula(formula).get_subformulas()
+            symbols.update(s.str_representation() for s in prop_symbols)
+        return sorted(symbols)
+
     @classmethod
     def filter_repeated_formulas(cls, formulas):
         """Clean repeated formulas in given set of formulas."""
@@ -263,11 +397,24 @@ class Formula:
 
 
 class TruthTable:
-    """Represent a truth table of a formula."""
+    """
+    Represent a truth table of a formula.
 
-    def __init__(self, expression):
-        """."""
+    When simplify is True the formula is simplified before the table is
+    built, so the table has fewer columns but they are not the ones of the
+    formula as it was written.
+    """
+
+    def __init__(self, expression, simplify=False):
+        """
+        Build the table of the expression.
+
+        The expression can be a string or a formula built in Python
+        (see lp.syntax.Composable).
+        """
         self.formula = Interpreter.parse_expression(expression)
+        if simplify:
+            self.formula = Simplifier.simplify(self.formula)
         self.formula_handler = Formula(self.formula)
         self.subformulas,\
             self.prop_symbols = self.formula_handler.get_subformulas()
@@ -398,7 +545,7 @@ class TruthTable:
             str_table += '['
             for formula_index, formula in enumerate(self.lines[0]):
                 str_table += formula.str_representation()
-                if formula_index is not len(self.lines[0]) - 1:
+                if formula_index != len(self.lines[0]) - 1:
                     str_table += ','
             str_table += '], '
             return str_table
@@ -412,21 +559,21 @@ class TruthTable:
                     str_table += 'V' if value else 'F'
                     # Separate each value with a comma,
                     # if it is not the last value
-                    if column_index is not len(line) - 1:
+                    if column_index != len(line) - 1:
                         str_table += ','
                 str_table += ']'
                 return str_table
 
             str_table += '['
             for line_index, line in enumerate(self.lines):
-                if line_index is 0:
+                if line_index == 0:
                     # Already treated above
                     continue
 
                 str_table = build_values_columns(str_table, line)
 
                 # Separate each line with a comma, if it is not the last line
-                if line_index is not len(self.lines) - 1:
+                if line_index != len(self.lines) - 1:
                     str_table += ', '
             str_table += ']'
 
@@ -438,6 +585,71 @@ class TruthTable:
 
         return str_table
 
+    # Encodings of the columns in the compact representation
+    COMPACT_ENCODINGS = ('hex', 'base64')
+
+    compact_pattern = re.compile(
+        r'\[([^\[\]]*)\], (hex|base64):([0-9]+):\[([^\[\]]*)\]'
+    )
+
+    def compact_representation(self, encoding='hex'):
+        """
+        Build the table compact string representation.
+
+        Each column is a bitset where the bit i is the value of the
+        formula in the line i + 1 of the table, encoded in hexadecimal
+        or base64 (little endian). Ex.: '[p,q,p&q], hex:4:[3,5,1]'
+        """
+        rows_quantity = len(self.lines) - 1
+        columns = []
+        for column_index in range(len(self.lines[0])):
+            bits = ''.join(
+                '1' if self.lines[line_index][column_index] else '0'
+                for line_index in range(rows_quantity, 0, -1)
+            )
+            column = int(bits, 2)
+            if encoding == 'hex':
+                columns.append(format(column, 'x'))
+            elif encoding == 'base64':
+                column = column.to_bytes((rows_quantity + 7) // 8, 'little')
+                columns.append(base64.b64encode(column).decode('ascii'))
+            else:
+                raise Exception('Invalid encoding "%s".' % encoding)
+
+        return '[%s], %s:%d:[%s]' % (
+            ','.join(f.str_representation() for f in self.lines[0]),
+            encoding,
+            rows_quantity,
+            ','.join(columns)
+        )
+
+    @classmethod
+    def decode_compact_representation(cls, compact_table):
+        """Turn a compact representation to the table str_representation."""
+        matches = cls.compact_pattern.fullmatch(compact_table)
+        if not matches:
+            raise Exception('Invalid compact table "%s".' % compact_table)
+        formulas, encoding, rows_quantity, encoded_columns = matches.groups()
+        rows_quantity = int(rows_quantity)
+
+        columns = []
+        for encoded_column in encoded_columns.split(','):
+            if encoding == 'hex':
+                columns.append(int(encoded_column, 16))
+            else:
+                columns.append(int.from_bytes(
+                    base64.b64decode(encoded_column), 'little'
+                ))
+
+        lines = [
+            '[%s]' % ','.join(
+                'V' if column >> line_index & 1 else 'F'
+                for column in columns
+            )
+            for line_index in range(rows_quantity)
+        ]
+        return '[%s], [%s]' % (formulas, ', '.join(lines))
+
     def print_table(self):
         """Visually representation of the truth table."""
         for line in self.lines:
@@ -449,14 +661,24 @@ class TruthTable:
 class SetTruthTable(TruthTable):
     """Represent a truth table of set of formulas."""
 
-    def __init__(self, expressions):
-        """."""
+    def __init__(self, expressions, simplify=False):
+        """
+        Build the table of the expressions.
+
+        Each expression can be a string or a formula built in Python
+        (see lp.syntax.Composable).
+        """
+        # The formulas are indexed by their representation as written,
+        # even when the stored formula is the simplified one
         self.formulas = {}
         all_subformulas = []
         all_symbols = []
         for expression in expressions:
             formula = Interpreter.parse_expression(expression)
-            self.formulas[formula.str_representation()] = formula
+            formula_repr = formula.str_representation()
+            if simplify:
+                formula = Simplifier.simplify(formula)
+            self.formulas[formula_repr] = formula
             formula_handler = Formula(formula)
             subformulas, prop_symbols = formula_handler.get_subformulas()
             all_subformulas.extend(subformulas)
@@ -476,6 +698,13 @@ class SetTruthTable(TruthTable):
         if not formulas:
             formulas = self.formulas
 
+        # The columns of the table are the formulas stored in the set
+        formulas = set(
+            self.formulas[formula].str_representation()
+            if formula in self.formulas else formula
+            for formula in formulas
+        )
+
         formula_indexes = {}
         # Find out the formulas indexes in the table
         for formula_index, formula in enumerate(self.lines[0]):
@@ -0,0 +1,68 @@
+"""Provide means to query a set of premises many times."""
+
+from lp.interpreter import Interpreter, Formula
+from lp.cover import CubeCover
+from lp import bitsets
+
+
+class KnowledgeBase:
+    """
+    A set of premises that is evaluated once to answer many queries.
+
+    The models of the premises are kept as a bitset over the lines of
+    their truth table, so a query only evaluates its own formulas.
+    """
+
+    def __init__(self, expressions):
+        """Evaluate the premises."""
+        self.premises = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+        self.symbols = Formula.get_symbols(self.premises)
+        self.models, self.columns, self.mask = bitsets.get_models(
+            self.premises, self.symbols
+        )
+
+    def is_consistent(self, expressions=()):
+        """Check if the premises plus the given formulas are consistent."""
+        formulas = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+        models, columns, mask = self.extend(formulas)
+        for formula in formulas:
+            models &= formula.evaluate_columns(columns, mask)
+        return models != 0
+
+    def entails(self, expression):
+        """Check if the formula is logic consequence of the premises."""
+        formula = Interpreter.parse_expression(expression)
+        models, columns, mask = self.extend([formula])
+        return models & ~formula.evaluate_columns(columns, mask) == 0
+
+    def get_models_cover(self):
+        """Get the models of the premises as a cover of cubes."""
+        return CubeCover(self.symbols).get_cubes(self.models)
+
+    def extend(self, formulas):
+        """
+        Get the models of the premises over the symbols of the formulas too.
+
+        The new symbols come first in the table, so the models of the
+        premises just repeat for each valuation of the new symbols.
+        Return the models, the symbols columns and the mask of the table.
+        """
+        new_symbols = [
+            symbol for symbol in Formula.get_symbols(formulas)
+            if symbol not in self.columns
+        ]
+        if not new_symbols:
+            return self.models, self.columns, self.mask
+
+        symbols = new_symbols + self.symbols
+        mask = bitsets.full(2**len(symbols))
+        models = bitsets.repeat(
+            self.models, 2**len(self.symbols), 2**len(new_symbols)
+        )
+        return models, bitsets.symbol_columns(symbols), mask
@@ -0,0 +1,105 @@
+"""Provide means to simplify formulas before evaluating them."""
+
+from lp.syntax import Negation, Conjunction, Disjunction
+from lp.syntax import Implication, BiImplication
+from lp.syntax import build
+
+
+class Simplifier:
+    """
+    Normalize a formula to reduce the number of its subformulas.
+
+    The applied rules preserve the formula semantics:
+
+        * Double negation: --A = A
+        * Idempotence: A & A = A, A | A = A
+        * Absorption: A & (A | B) = A, A | (A & B) = A
+        * Commutativity: the operands of &, | and <-> are sorted,
+          so A & B and B & A share the same representation.
+
+    The given formula is never modified, a new one is built instead.
+    """
+
+    @classmethod
+    def simplify(cls, formula):
+        """Return a simplified formula equivalent to the given one."""
+        if formula.is_a(Negation):
+            arg = cls.simplify(formula.arg1)
+            if arg.is_a(Negation):
+                # Double negation
+                return arg.arg1
+            return cls.build(Negation, arg)
+
+        elif formula.is_a(Conjunction) or formula.is_a(Disjunction):
+            return cls.simplify_chain(formula)
+
+        elif formula.is_a(BiImplication):
+            args = sorted(
+                [cls.simplify(formula.arg1), cls.simplify(formula.arg2)],
+                key=lambda f: f.str_representation()
+            )
+            return cls.build(BiImplication, *args)
+
+        elif formula.is_a(Implication):
+            return cls.build(
+                Implication,
+                cls.simplify(formula.arg1),
+                cls.simplify(formula.arg2)
+            )
+
+        # Propositional symbols can not be simplified
+        return formula
+
+    @classmethod
+    def simplify_chain(cls, formula):
+        """Simplify a chain of conjunctions or disjunctions."""
+        operator = type(formula)
+        dual = Disjunction if operator is Conjunction else Conjunction
+
+        # Idempotence: keep only one operand of each representation
+        operands = {}
+        for operand in cls.get_operands(formula, operator):
+            operand = cls.simplify(operand)
+            for simplified in cls.get_operands(operand, operator):
+                operands.setdefault(simplified.str_representation(),
+                                    simplified)
+
+        # Absorption: an operand is dropped if it is a dual chain that
+        # contains all the terms of another operand
+        terms = {
+            key: set(
+                f.str_representation() for f in cls.get_operands(f, dual)
+            )
+            for key, f in operands.items()
+        }
+        absorbed = set()
+        for key in operands:
+            for other in operands:
+                if other == key or other in absorbed:
+                    continue
+                if terms[other] <= terms[key]:
+                    absorbed.add(key)
+                    break
+
+        remaining = sorted(
+            (f for key, f in operands.items() if key not in absorbed),
+            key=lambda f: f.str_representation()
+        )
+
+        result = remaining[0]
+        for operand in remaining[1:]:
+            result = cls.build(operator, result, operand)
+        return result
+
+    @classmethod
+    def get_operands(cls, formula, operator):
+        """Flatten a chain of the given operator into its operands."""
+        if not formula.is_a(operator):
+            return [formula]
+        return (cls.get_operands(formula.arg1, operator) +
+                cls.get_operands(formula.arg2, operator))
+
+    @classmethod
+    def build(cls, operator, *args):
+        """Create a new operator node with the given args."""
+        return build(operator, *args)
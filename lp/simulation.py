@@ -0,0 +1,99 @@
+"""Provide means to look for countermodels without building truth tables."""
+
+import random
+
+from lp.interpreter import Interpreter, Formula
+from lp import bitsets
+
+
+class Simulation:
+    """
+    Evaluate formulas on a sample of valuations of their symbols.
+
+    The sample has the corner cases (all symbols true, all symbols false
+    and each symbol as the only true one) followed by seeded random
+    valuations, evaluated all at once as bitsets with one bit per
+    valuation.
+    """
+
+    SAMPLES = 64
+    SEED = 0
+
+    def __init__(self, symbols, samples=SAMPLES, seed=SEED):
+        """Build the columns of the symbols in the sampled valuations."""
+        self.symbols = sorted(symbols)
+        self.size = 2 + len(self.symbols) + samples
+        self.mask = bitsets.full(self.size)
+
+        generator = random.Random(seed)
+        self.columns = {}
+        for index, symbol in enumerate(self.symbols):
+            # Valuation 0 is all true, 1 is all false, then the one-hots
+            column = 1 | 1 << (2 + index)
+            column |= generator.getrandbits(samples) << (2 + len(self.symbols))
+            self.columns[symbol] = column
+
+    @classmethod
+    def find_countermodel(cls, premises, conclusion, samples=SAMPLES,
+                          seed=SEED):
+        """
+        Look for a valuation where the premises are true and the
+        conclusion is false.
+
+        Return the valuation as a dict like {'p': True, 'q': False},
+        or None if no sampled valuation is a countermodel.
+        """
+        premises = [
+            Interpreter.parse_expression(premise) for premise in premises
+        ]
+        conclusion = Interpreter.parse_expression(conclusion)
+
+        simulation = cls(
+            Formula.get_symbols(premises + [conclusion]), samples, seed
+        )
+        countermodels = simulation.mask & ~conclusion.evaluate_columns(
+            simulation.columns, simulation.mask
+        )
+        for premise in premises:
+            if not countermodels:
+                break
+            countermodels &= premise.evaluate_columns(
+                simulation.columns, simulation.mask
+            )
+
+        if not countermodels:
+            return None
+        return simulation.get_valuation(
+            (countermodels & -countermodels).bit_length() - 1
+        )
+
+    @classmethod
+    def group(cls, expressions, samples=SAMPLES, seed=SEED):
+        """
+        Group the formulas by their values in the sampled valuations.
+
+        Equivalent formulas have the same values, so they end up in the
+        same group, but the formulas of a group may still differ outside
+        the sample. Return the lists of the given expressions, in order
+        of appearance.
+        """
+        formulas = [
+            Interpreter.parse_expression(expression)
+            for expression in expressions
+        ]
+        simulation = cls(Formula.get_symbols(formulas), samples, seed)
+
+        groups = {}
+        for expression, formula in zip(expressions, formulas):
+            column = formula.evaluate_columns(
+                simulation.columns, simulation.mask
+            )
+            groups.setdefault(column, []).append(expression)
+        return list(groups.values())
+
+    def get_valuation(self, index):
+        """Get the sampled valuation at index."""
+        return {
+            symbol: bool(column >> index & 1)
+            for symbol, column in self.columns.items()
+        }
@@ -35,7 +35,54 @@ class Symbol:
         return self.value
 
 
-class PropositionalSymbol(Symbol):
+class Composable:
+    """
+    Build formulas with the Python operators.
+
+    The negation is ~p, the conjunction p & q, the disjunction p | q,
+    the implication p >> q and the bi-implication p.iff(q).
+
+    The operators keep the Python precedence, where >> binds tighter
+    than & and |: p & q >> r is p&(q->r), so write (p & q) >> r for
+    the implication of the conjunction.
+    """
+
+    def __invert__(self):
+        """Get the negation of the formula."""
+        return build(Negation, self)
+
+    def __and__(self, other):
+        """Get the conjunction of the formulas."""
+        return build(Conjunction, self, other)
+
+    def __or__(self, other):
+        """Get the disjunction of the formulas."""
+        return build(Disjunction, self, other)
+
+    def __rshift__(self, other):
+        """Get the implication of the other formula by this one."""
+        return build(Implication, self, other)
+
+    def iff(self, other):
+        """Get the bi-implication of the formulas."""
+        return build(BiImplication, self, other)
+
+
+def build(operator, *args):
+    """Build an operator over already built formulas."""
+    for arg in args:
+        if not isinstance(arg, Composable):
+            raise TypeError('Invalid formula "%s"' % (arg,))
+
+    formula = operator(operator.SYMBOL)
+    if formula.is_a(UnaryOperator):
+        formula.set_arg(*args)
+    else:
+        formula.set_args(*args)
+    return formula
+
+
+class PropositionalSymbol(Composable, Symbol):
     """
     Describes the propositional symbols of the language.
 
@@ -65,11 +112,31 @@ class PropositionalSymbol(Symbol):
         """Evaluate symbol with given values."""
         return symbol_values[self.str_representation()]
 
+    def evaluate_columns(self, columns, mask):
+        """Get the column of the symbol in the given columns."""
+        return columns[self.str_representation()]
+
     def count_terms(self):
         """Count the terms of the formula."""
         return 1
 
 
+class Var(PropositionalSymbol):
+    """
+    A propositional symbol created by name, to build formulas in Python.
+
+    Example:
+        p, q = Var('p'), Var('q1')
+        formula = ~p | (p >> q)
+    """
+
+    def __init__(self, name):
+        """Create the propositional symbol, checking its name."""
+        if not self.check(name):
+            raise Exception('Invalid propositional symbol "%s"' % name)
+        super().__init__(name)
+
+
 class PontuationSymbol(Symbol):
     """
     Describes the pontuation symbols of the language.
@@ -95,7 +162,7 @@ class ClosingParenthesis(PontuationSymbol):
     pattern = '\)'
 
 
-class Operator(Symbol):
+class Operator(Composable, Symbol):
     """Base class for language operators."""
 
     class Associativity:
@@ -112,6 +179,15 @@ class Operator(Symbol):
         """Evaluate an operator with given values."""
         raise NotImplementedError
 
+    def evaluate_columns(self, columns, mask):
+        """
+        Evaluate an operator over columns of values at once.
+
+        The columns can be integer bitsets, where mask has all the bits of
+        the column set, or NumPy boolean arrays, where mask is True.
+        """
+        raise NotImplementedError
+
     def __str__(self):
         """Return the string representation as str."""
         return self.str_representation()
@@ -200,6 +276,10 @@ class Negation(UnaryOperator):
         """Evaluate a negation with given values."""
         return not self.arg1.evaluate(symbol_values)
 
+    def evaluate_columns(self, columns, mask):
+        """Evaluate a negation over columns of values."""
+        return mask & ~self.arg1.evaluate_columns(columns, mask)
+
 
 class Conjunction(BinaryOperator):
     """Describe the conjunction operator."""
@@ -216,6 +296,11 @@ class Conjunction(BinaryOperator):
         return (self.arg1.evaluate(symbol_values) and
                 self.arg2.evaluate(symbol_values))
 
+    def evaluate_columns(self, columns, mask):
+        """Evaluate a conjunction over columns of values."""
+        return (self.arg1.evaluate_columns(columns, mask) &
+                self.arg2.evaluate_columns(columns, mask))
+
 
 class Disjunction(BinaryOperator):
     """Describe the disjunction operator."""
@@ -232,6 +317,11 @@ class Disjunction(BinaryOperator):
         return (self.arg1.evaluate(symbol_values) or
                 self.arg2.evaluate(symbol_values))
 
+    def evaluate_columns(self, columns, mask):
+        """Evaluate a disjunction over columns of values."""
+        return (self.arg1.evaluate_columns(columns, mask) |
+                self.arg2.evaluate_columns(columns, mask))
+
 
 class Implication(BinaryOperator):
     """Describe the implication operator."""
@@ -252,6 +342,11 @@ class Implication(BinaryOperator):
         return (not self.arg1.evaluate(symbol_values) or
                 self.arg2.evaluate(symbol_values))
 
+    def evaluate_columns(self, columns, mask):
+        """Evaluate an implication over columns of values."""
+        return ((mask & ~self.arg1.evaluate_columns(columns, mask)) |
+                self.arg2.evaluate_columns(columns, mask))
+
 
 class BiImplication(BinaryOperator):
     """Describe the bi-implication operator."""
@@ -276,3 +371,10 @@ class BiImplication(BinaryOperator):
             not self.arg2.evaluate(symbol_values) or
             self.arg1.evaluate(symbol_values)
         )
+
+    def evaluate_columns(self, columns, mask):
+        """Evaluate a bi-implication over columns of values."""
+        return mask & ~(
+            self.arg1.evaluate_columns(columns, mask) ^
+            self.arg2.evaluate_columns(columns, mask)
+        )
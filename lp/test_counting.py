@@ -0,0 +1,83 @@
+"""Check the model counter against brute force over the truth table."""
+
+import itertools
+import random
+import unittest
+
+from lp.counting import ClauseSet, ModelCounter
+from lp.interpreter import Interpreter
+
+
+SYMBOLS = ['p', 'q', 'r', 's', 't']
+OPERATORS = ['&', '|', '->', '<->']
+
+
+def random_expression(generator, depth):
+    """Build a random expression over SYMBOLS."""
+    if depth == 0 or generator.random() < 0.25:
+        negation = '-' if generator.random() < 0.3 else ''
+        return negation + generator.choice(SYMBOLS)
+    return '(%s)%s(%s)' % (
+        random_expression(generator, depth - 1),
+        generator.choice(OPERATORS),
+        random_expression(generator, depth - 1),
+    )
+
+
+def count_by_brute_force(formulas, symbols):
+    """Count the valuations of the symbols that satisfy all formulas."""
+    return sum(
+        all(formula.evaluate(dict(zip(symbols, values)))
+            for formula in formulas)
+        for values in itertools.product([True, False], repeat=len(symbols))
+    )
+
+
+class ModelCounterTest(unittest.TestCase):
+    """Compare the counts with the enumeration of the valuations."""
+
+    def test_random_sets(self):
+        """Count the models of random sets of formulas."""
+        generator = random.Random(0)
+        for _ in range(300):
+            formulas = [
+                Interpreter.parse_expression(random_expression(generator, 3))
+                for _ in range(generator.randint(1, 3))
+            ]
+            symbols = sorted(ClauseSet(formulas).symbols)
+            self.assertEqual(
+                ModelCounter().count(formulas),
+                count_by_brute_force(formulas, symbols)
+            )
+
+    def test_extra_symbols(self):
+        """The extra symbols double the count each."""
+        formula = Interpreter.parse_expression('p->q')
+        self.assertEqual(ModelCounter().count([formula], ['r', 's']), 12)
+
+    def test_independent_components(self):
+        """Formulas sharing no symbols have their counts multiplied."""
+        formulas = [
+            Interpreter.parse_expression('p|q'),
+            Interpreter.parse_expression('r<->s'),
+            Interpreter.parse_expression('-t'),
+        ]
+        self.assertEqual(ModelCounter().count(formulas), 3 * 2 * 1)
+
+    def test_long_chain(self):
+        """A long chain of implications does not hit the recursion limit."""
+        expression = '&'.join(
+            '(p%d->p%d)' % (index, index + 1) for index in range(300)
+        )
+        formula = Interpreter.parse_expression(expression)
+        # A model is the index of the first true symbol, or none true
+        self.assertEqual(ModelCounter().count([formula]), 302)
+
+    def test_contradiction(self):
+        """A contradiction has no models."""
+        formula = Interpreter.parse_expression('p&-p')
+        self.assertEqual(ModelCounter().count([formula]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
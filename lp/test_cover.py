@@ -0,0 +1,86 @@
+"""Check the covers of cubes against the enumeration of the models."""
+
+import random
+import unittest
+
+from lp.cover import CubeCover
+from lp.interpreter import Formula
+
+
+SYMBOLS = ['p', 'q', 'r', 's', 't']
+
+
+def get_valuations(cover):
+    """Get the valuation of each line of the truth table of the cover."""
+    return [
+        {
+            symbol: bool(column >> line & 1)
+            for symbol, column in zip(cover.symbols, cover.columns)
+        }
+        for line in range(2**len(cover.symbols))
+    ]
+
+
+def get_lines(cube, valuations):
+    """Get the lines of the table where the cube holds."""
+    return {
+        line for line, valuation in enumerate(valuations)
+        if all(valuation[symbol] == value for symbol, value in cube.items())
+    }
+
+
+class CubeCoverTest(unittest.TestCase):
+    """Compare the covers with random sets of models."""
+
+    def check_cover(self, cover, models):
+        """Check that the cover is exact, prime and irredundant."""
+        valuations = get_valuations(cover)
+        model_lines = {
+            line for line in range(len(valuations)) if models >> line & 1
+        }
+        cubes = cover.get_cubes(models)
+        cube_lines = [get_lines(cube, valuations) for cube in cubes]
+
+        # Exact: the cubes hold in the models only, and in all of them
+        covered = set().union(*cube_lines)
+        self.assertEqual(covered, model_lines)
+
+        # Prime: no symbol can be left out of a cube
+        for cube in cubes:
+            for symbol in cube:
+                larger_cube = {s: v for s, v in cube.items() if s != symbol}
+                self.assertFalse(
+                    get_lines(larger_cube, valuations) <= model_lines
+                )
+
+        # Irredundant: no cube can be left out of the cover
+        for index in range(len(cubes)):
+            others = set().union(
+                *(cube_lines[:index] + cube_lines[index + 1:])
+            )
+            self.assertNotEqual(others, model_lines)
+
+    def test_random_models(self):
+        """Cover random sets of models of up to five symbols."""
+        generator = random.Random(0)
+        for _ in range(300):
+            cover = CubeCover(SYMBOLS[:generator.randint(1, 5)])
+            models = generator.getrandbits(2**len(cover.symbols))
+            self.check_cover(cover, models)
+
+    def test_all_and_no_models(self):
+        """The tautologies have the empty cube, contradictions no cube."""
+        cover = CubeCover(SYMBOLS)
+        self.assertEqual(cover.get_cubes(cover.mask), [{}])
+        self.assertEqual(cover.get_cubes(0), [])
+
+    def test_formulas_cover(self):
+        """Cover the models of a set of formulas."""
+        cubes = Formula.get_models_cover(['p->q', 'q->r'])
+        self.assertCountEqual(
+            cubes, [{'p': False, 'q': False}, {'q': True, 'r': True}]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
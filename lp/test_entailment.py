@@ -0,0 +1,82 @@
+"""Check the cached verdicts against brute force."""
+
+import itertools
+import random
+import unittest
+
+from lp.entailment import EntailmentCache
+from lp.interpreter import Interpreter
+
+
+SYMBOLS = ['p', 'q', 'r']
+OPERATORS = ['&', '|', '->', '<->']
+
+
+def random_expression(generator):
+    """Build a random formula of two literals over SYMBOLS."""
+    literals = [
+        ('-' if generator.random() < 0.5 else '') + generator.choice(SYMBOLS)
+        for _ in range(2)
+    ]
+    return '(%s)%s(%s)' % (
+        literals[0], generator.choice(OPERATORS), literals[1]
+    )
+
+
+def is_consistent_by_brute_force(expressions):
+    """Check if some valuation of SYMBOLS satisfies all formulas."""
+    formulas = [Interpreter.parse_expression(e) for e in expressions]
+    return any(
+        all(formula.evaluate(dict(zip(SYMBOLS, values)))
+            for formula in formulas)
+        for values in itertools.product([True, False], repeat=len(SYMBOLS))
+    )
+
+
+class EntailmentCacheTest(unittest.TestCase):
+    """Compare the cached verdicts with the truth table."""
+
+    def test_random_sets(self):
+        """Every verdict given by the cache is the right one."""
+        generator = random.Random(0)
+        pool = [random_expression(generator) for _ in range(12)]
+        cache = EntailmentCache()
+        known = 0
+        for _ in range(500):
+            expressions = generator.sample(pool, generator.randint(1, 5))
+            consistent = is_consistent_by_brute_force(expressions)
+            cached = cache.is_consistent(expressions)
+            if cached is None:
+                cache.store(expressions, consistent)
+            else:
+                known += 1
+                self.assertEqual(cached, consistent)
+        # The cache answered part of the queries
+        self.assertGreater(known, 0)
+
+    def test_monotonicity(self):
+        """Subsets of consistent sets and supersets of inconsistent ones."""
+        cache = EntailmentCache()
+        cache.store(['p', 'q', 'r'], True)
+        cache.store(['p', '-p'], False)
+        self.assertTrue(cache.is_consistent(['q', 'p']))
+        self.assertTrue(cache.is_consistent(['p&q']))
+        self.assertFalse(cache.is_consistent(['-p', 'q', 'p']))
+        self.assertIsNone(cache.is_consistent(['p', 's']))
+        self.assertIsNone(cache.is_consistent(['-p', 'q']))
+
+    def test_max_sets(self):
+        """No set is stored beyond the maximum, nor indexed."""
+        cache = EntailmentCache(max_sets=1)
+        cache.store(['p'], True)
+        cache.store(['q'], True)
+        self.assertEqual(len(cache.consistent), 1)
+        self.assertIsNone(cache.is_consistent(['q']))
+        for positions in cache.consistent_index.values():
+            self.assertTrue(all(
+                position < len(cache.consistent) for position in positions
+            ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Check the Horn and 2-CNF deciders against brute force."""
+
+import itertools
+import random
+import unittest
+
+from lp.fragments import FragmentSolver
+from lp.fragments import get_components
+from lp.fragments import is_horn_satisfiable, is_two_cnf_satisfiable
+from lp.interpreter import Interpreter
+
+
+VARIABLES = 5
+SYMBOLS = ['p', 'q', 'r', 's', 't']
+
+
+def random_literal(generator):
+    """Get a random signed variable."""
+    variable = generator.randint(1, VARIABLES)
+    return variable if generator.random() < 0.5 else -variable
+
+
+def random_horn_clause(generator):
+    """Get a random clause with at most one positive literal."""
+    body = [-generator.randint(1, VARIABLES)
+            for _ in range(generator.randint(0, 3))]
+    head = [generator.randint(1, VARIABLES)] \
+        if generator.random() < 0.7 or not body else []
+    return frozenset(body + head)
+
+
+def random_two_clause(generator):
+    """Get a random clause of one or two literals."""
+    return frozenset(
+        random_literal(generator) for _ in range(generator.randint(1, 2))
+    )
+
+
+def is_satisfiable_by_brute_force(clauses):
+    """Check if some valuation of the variables satisfies all clauses."""
+    for values in itertools.product([True, False], repeat=VARIABLES):
+        if all(any(values[abs(literal) - 1] == (literal > 0)
+                   for literal in clause)
+               for clause in clauses):
+            return True
+    return False
+
+
+def get_reachable(graph, node):
+    """Get the nodes reachable from a node, itself included."""
+    reachable = {node}
+    pending = [node]
+    while pending:
+        for successor in graph.get(pending.pop(), ()):
+            if successor not in reachable:
+                reachable.add(successor)
+                pending.append(successor)
+    return reachable
+
+
+def random_clause_expression(generator, horn):
+    """Get a random Horn or 2-CNF clause written as a formula."""
+    if horn:
+        body = generator.sample(SYMBOLS, generator.randint(0, 2))
+        head = generator.choice(SYMBOLS)
+        if not body:
+            return head
+        return '%s->%s' % ('&'.join(body), head)
+    literals = [
+        ('-' if generator.random() < 0.5 else '') + generator.choice(SYMBOLS)
+        for _ in range(generator.randint(1, 2))
+    ]
+    return '|'.join(literals)
+
+
+def entails_by_brute_force(premises, conclusion):
+    """Check the entailment over all the valuations of SYMBOLS."""
+    premises = [Interpreter.parse_expression(p) for p in premises]
+    conclusion = Interpreter.parse_expression(conclusion)
+    for values in itertools.product([True, False], repeat=len(SYMBOLS)):
+        valuation = dict(zip(SYMBOLS, values))
+        if all(premise.evaluate(valuation) for premise in premises) and \
+                not conclusion.evaluate(valuation):
+            return False
+    return True
+
+
+class ComponentsTest(unittest.TestCase):
+    """Compare the Tarjan components with the mutual reachability."""
+
+    def test_random_graphs(self):
+        """Two nodes share a component if they reach each other."""
+        generator = random.Random(0)
+        for _ in range(200):
+            nodes = range(generator.randint(1, 8))
+            graph = {}
+            for _ in range(generator.randint(0, 16)):
+                graph.setdefault(generator.choice(nodes), []).append(
+                    generator.choice(nodes)
+                )
+            components = get_components(graph)
+            reachable = {
+                node: get_reachable(graph, node) for node in components
+            }
+            for a in components:
+                for b in components:
+                    self.assertEqual(
+                        components[a] == components[b],
+                        b in reachable[a] and a in reachable[b]
+                    )
+
+    def test_long_cycle(self):
+        """A long cycle does not hit the recursion limit."""
+        graph = {node: [(node + 1) % 5000] for node in range(5000)}
+        self.assertEqual(len(set(get_components(graph).values())), 1)
+
+
+class FragmentsTest(unittest.TestCase):
+    """Compare the fragment deciders with the truth table."""
+
+    def test_horn_clauses(self):
+        """Decide random Horn clauses by unit propagation."""
+        generator = random.Random(0)
+        for _ in range(300):
+            clauses = [random_horn_clause(generator)
+                       for _ in range(generator.randint(1, 8))]
+            self.assertEqual(is_horn_satisfiable(clauses),
+                             is_satisfiable_by_brute_force(clauses))
+
+    def test_two_cnf_clauses(self):
+        """Decide random 2-CNF clauses by their implication graph."""
+        generator = random.Random(0)
+        for _ in range(300):
+            clauses = [random_two_clause(generator)
+                       for _ in range(generator.randint(1, 10))]
+            self.assertEqual(is_two_cnf_satisfiable(clauses),
+                             is_satisfiable_by_brute_force(clauses))
+
+    def test_entailment(self):
+        """Decide random entailments of Horn and 2-CNF premises."""
+        generator = random.Random(0)
+        for _ in range(200):
+            horn = generator.random() < 0.5
+            premises = [random_clause_expression(generator, horn)
+                        for _ in range(generator.randint(1, 5))]
+            conclusion = random_clause_expression(generator, horn)
+            self.assertEqual(
+                FragmentSolver.entails(premises, conclusion),
+                entails_by_brute_force(premises, conclusion)
+            )
+
+    def test_other_formulas(self):
+        """The formulas outside the fragments are left undecided."""
+        self.assertIsNone(FragmentSolver.is_satisfiable(['(p|q)<->r']))
+        self.assertIsNone(FragmentSolver.is_satisfiable(['p|q|r', 'p|q']))
+
+
+if __name__ == '__main__':
+    unittest.main()
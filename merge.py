@@ -0,0 +1,47 @@
+"""Merge the results and errors of the shards of a run (see shards.py)."""
+
+import argparse
+import sys
+
+from shards import merge_results, merge_errors
+
+
+def main(args=None):
+    """Run the merge with the command line arguments."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        'result_file',
+        help='the file to write the merged results, or - for the '
+             'standard output'
+    )
+    arg_parser.add_argument(
+        'shard_files', nargs='+', metavar='shard_file',
+        help='the results file of each shard'
+    )
+    arg_parser.add_argument(
+        '--errors', nargs='+', default=[], metavar='FILE',
+        help='the errors written by each shard; the merged errors are '
+             'written to the standard output, or to the standard error '
+             'if the results are'
+    )
+    args = arg_parser.parse_args(args)
+
+    shard_files = [open(shard_file) for shard_file in args.shard_files]
+    error_files = [open(error_file) for error_file in args.errors]
+    if args.result_file == '-':
+        results_file, errors_file = sys.stdout, sys.stderr
+    else:
+        results_file, errors_file = open(args.result_file, 'w'), sys.stdout
+
+    try:
+        merge_results(shard_files, results_file)
+        merge_errors(error_files, errors_file)
+    finally:
+        for file in shard_files + error_files:
+            file.close()
+        if results_file is not sys.stdout:
+            results_file.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Collect aggregate metrics of a run and export them."""
+
+import json
+import os
+import time
+
+
+class Histogram:
+    """Count observed values in cumulative buckets, like Prometheus."""
+
+    def __init__(self, buckets):
+        """Create an empty histogram with the given upper bounds."""
+        self.buckets = sorted(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        """Count a value in every bucket it fits in."""
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def to_dict(self):
+        """Get the histogram as a dict."""
+        return {
+            'buckets': {
+                str(bound): count
+                for bound, count in zip(self.buckets, self.counts)
+            },
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+    def to_prometheus(self, name, labels=''):
+        """Get the histogram samples in the Prometheus text format."""
+        separator = ',' if labels else ''
+        samples = [
+            '%s_bucket{%s%sle="%s"} %d' % (
+                name, labels, separator, format_bound(bound), count
+            )
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        samples.append('%s_bucket{%s%sle="+Inf"} %d' % (
+            name, labels, separator, self.count
+        ))
+        labels = '{%s}' % labels if labels else ''
+        samples.append('%s_sum%s %s' % (name, labels, self.sum))
+        samples.append('%s_count%s %d' % (name, labels, self.count))
+        return samples
+
+
+class Metrics:
+    """
+    Throughput and latency metrics of a run.
+
+    The parser counts the lines, the parse errors and the bytes written,
+    and observes the latency of each line with the symbols and evaluated
+    rows reported by OperationHandler, which counts the lines over the
+    limits. The evaluated rows are the truth table rows of the engines
+    chosen for the lines, as estimated before the evaluation.
+    """
+
+    # Upper bounds of the latency buckets, in seconds
+    LATENCY_BUCKETS = [
+        0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60, 600
+    ]
+    # Upper bounds of the symbols quantity buckets
+    SYMBOLS_BUCKETS = [1, 2, 4, 8, 12, 16, 20, 24, 28, 32, 64, 128]
+
+    PREFIX = 'lp_'
+
+    def __init__(self, json_file=None, prometheus_file=None, interval=None):
+        """
+        Start the metrics of a run.
+
+        They are exported to the given files by export, and also by
+        export_if_due every interval seconds during the run.
+        """
+        self.json_file = json_file
+        self.prometheus_file = prometheus_file
+        self.interval = interval
+        self.start = self.last_export = time.time()
+        self.lines = 0
+        self.parse_errors = 0
+        self.over_limits = 0
+        self.bytes_written = 0
+        self.rows_evaluated = 0
+        self.latencies = {}
+        self.symbols = Histogram(self.SYMBOLS_BUCKETS)
+
+    def observe_operation(self, operation, seconds, symbols=None, rows=0):
+        """Record a handled line of the operation."""
+        if operation not in self.latencies:
+            self.latencies[operation] = Histogram(self.LATENCY_BUCKETS)
+        self.latencies[operation].observe(seconds)
+        if symbols is not None:
+            self.symbols.observe(symbols)
+        self.rows_evaluated += rows
+
+    def get_lines_per_second(self):
+        """Get the throughput of the run so far."""
+        elapsed = time.time() - self.start
+        return self.lines / elapsed if elapsed else 0.0
+
+    def to_dict(self):
+        """Get the metrics as a dict."""
+        return {
+            'elapsed_seconds': time.time() - self.start,
+            'lines': self.lines,
+            'lines_per_second': self.get_lines_per_second(),
+            'parse_errors': self.parse_errors,
+            'over_limits': self.over_limits,
+            'bytes_written': self.bytes_written,
+            'rows_evaluated': self.rows_evaluated,
+            'latency_seconds': {
+                operation: histogram.to_dict()
+                for operation, histogram in sorted(self.latencies.items())
+            },
+            'symbols': self.symbols.to_dict(),
+        }
+
+    def to_prometheus(self):
+        """Get the metrics in the Prometheus text format."""
+        lines = []
+
+        def add(name, metric_type, help_text, samples):
+            name = self.PREFIX + name
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s %s' % (name, metric_type))
+            lines.extend(
+                sample if sample.startswith(name) else
+                '%s %s' % (name, sample)
+                for sample in samples
+            )
+
+        add('lines_total', 'counter', 'Lines read.', [str(self.lines)])
+        add('lines_per_second', 'gauge', 'Lines read by second.',
+            [repr(self.get_lines_per_second())])
+        add('parse_errors_total', 'counter', 'Lines with error.',
+            [str(self.parse_errors)])
+        add('over_limits_total', 'counter', 'Lines over the limits.',
+            [str(self.over_limits)])
+        add('bytes_written_total', 'counter', 'Bytes of results written.',
+            [str(self.bytes_written)])
+        add('rows_evaluated_total', 'counter',
+            'Truth table rows evaluated, as estimated for the engines.',
+            [str(self.rows_evaluated)])
+
+        latency_samples = []
+        for operation, histogram in sorted(self.latencies.items()):
+            latency_samples.extend(histogram.to_prometheus(
+                self.PREFIX + 'operation_latency_seconds',
+                'operation="%s"' % operation
+            ))
+        add('operation_latency_seconds', 'histogram',
+            'Time to handle a line, by operation.', latency_samples)
+        add('symbols', 'histogram', 'Propositional symbols of a line.',
+            self.symbols.to_prometheus(self.PREFIX + 'symbols'))
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """Write the metrics to their files, replacing them."""
+        if self.json_file:
+            replace_file(self.json_file, json.dumps(self.to_dict(), indent=2))
+        if self.prometheus_file:
+            replace_file(self.prometheus_file, self.to_prometheus())
+        self.last_export = time.time()
+
+    def export_if_due(self):
+        """Export the metrics if the interval has passed since the last."""
+        if self.interval and time.time() - self.last_export >= self.interval:
+            self.export()
+
+
+def format_bound(bound):
+    """Format a bucket bound as a Prometheus label value."""
+    return repr(float(bound))
+
+
+def replace_file(file_path, content):
+    """Replace a file content atomically, so readers never see it partial."""
+    temporary_file = file_path + '.tmp'
+    with open(temporary_file, 'w') as file:
+        file.write(content)
+    os.replace(temporary_file, file_path)
@@ -1,15 +1,113 @@
 """Describe the possible operations."""
 
-from lp.interpreter import Interpreter, TruthTable, SetTruthTable
+from lp.interpreter import Interpreter, Formula, TruthTable, SetTruthTable
+from lp.knowledge import KnowledgeBase
+from lp.engines import BitsetEngine, CountingEngine
+from lp.engines import ResourceLimitExceeded
+from lp.fragments import FragmentSolver
+from lp.simulation import Simulation
+from lp.simplifier import Simplifier
+from lp.syntax import Negation, BiImplication
+
+
+class KnowledgeBaseError(Exception):
+    """Raised when a line declares or references a knowledge base wrongly."""
 
 
 class Operation:
-    """Base class for operations."""
+    """
+    Base class for operations.
+
+    When full_table is False only the verdict is returned, so the truth
+    tables are built over the simplified formulas, or the verdict is
+    decided by the given engine (see lp.engines) without tables.
+    The table_format is 'text' or one of the TruthTable.COMPACT_ENCODINGS.
+
+    The formulas given to perform can be strings, as parsed from a line,
+    or formulas built in Python, like perform(p >> q, ~p | q) where
+    p, q = Var('p'), Var('q') (see lp.syntax.Composable).
+
+    When only the verdict is requested, the operations that check
+    satisfiability decide Horn and 2-CNF formulas in linear time (see
+    lp.fragments), without tables nor engines.
+
+    When prefilter is True, the operations that answer NAO when a
+    countermodel exists first look for one in a sample of valuations
+    (see lp.simulation), and answer with it without building tables.
+
+    When cover is True, the operations over a set of formulas give the
+    models of the set as a cover of cubes (see lp.cover) instead of the
+    truth table, like [SIM, [[p=V,r=F], [q=V]]].
+
+    The verdicts of the operations over sets of formulas are stored in
+    the given cache, if any (see lp.entailment), and reused when only
+    the verdict is requested.
+
+    The knowledge bases declared in a run are kept in the given dict,
+    by reference (see KnowledgeBaseDeclaration).
+    """
+
+    # Satisfiability checks an engine does to get the verdict
+    CHECKS = 1
+
+    def __init__(self, full_table=True, table_format='text', engine=None,
+                 prefilter=False, cover=False, cache=None,
+                 knowledge_bases=None):
+        """Set the operation output options."""
+        self.full_table = full_table
+        self.table_format = table_format
+        self.engine = engine
+        self.prefilter = prefilter
+        self.cover = cover
+        self.cache = cache
+        self.knowledge_bases = knowledge_bases
+        # The args and result of the last get_early_result call
+        self.early = None
+
+    def get_expressions(self, *args):
+        """
+        Get the formulas evaluated by the operation with the given args.
+
+        Return None if the operation does not evaluate them with engines.
+        """
+        return None
+
+    def get_engines(self, *args):
+        """
+        Get the engines that can evaluate the formulas with the given args.
+
+        Return None to let the engine selector choose among all the ones
+        that give the requested output.
+        """
+        return None
 
     def perform(self, *args):
         """Perform the operation."""
         raise NotImplementedError
 
+    def reject(self, error, *args):
+        """Take note that the operation is over the limits with the args."""
+        pass
+
+    def get_early_result(self, *args):
+        """
+        Get the result of the operation when it is known without
+        evaluating all the valuations, like from the cache.
+
+        It is decided once for the given args, so it can be asked before
+        choosing the engine and again when performing the operation.
+        Return None if the formulas are to be evaluated.
+        """
+        if self.early is None or len(self.early[0]) != len(args) or \
+                any(arg is not early_arg
+                    for arg, early_arg in zip(args, self.early[0])):
+            self.early = (args, self.decide_early(*args))
+        return self.early[1]
+
+    def decide_early(self, *args):
+        """Get the result known without evaluating all the valuations."""
+        return None
+
     def parse(self, line):
         """
         Generic parser for operations.
@@ -23,15 +121,136 @@ class Operation:
         args = line.split(',')
         return args[1:]
 
+    def build_result(self, verdict, truth_table):
+        """Build the operation result string."""
+        if not self.full_table:
+            return '[%s]' % verdict
+
+        if self.table_format == 'text':
+            table = truth_table.str_representation()
+        else:
+            table = truth_table.compact_representation(self.table_format)
+
+        return '[%s, [%s]]' % (verdict, table)
+
+    def build_cover_result(self, verdict, knowledge_base):
+        """Build the operation result with the cover of the models."""
+        return '[%s, [%s]]' % (verdict, ', '.join(
+            '[%s]' % self.format_valuation(cube)
+            for cube in knowledge_base.get_models_cover()
+        ))
+
+    def decide(self, *args):
+        """Get the verdict of the operation with the engine."""
+        raise NotImplementedError
+
+    def is_satisfiable(self, expressions):
+        """Check if the formulas have a common model with the engine."""
+        return self.engine.is_satisfiable([
+            self.parse_formula(expression) for expression in expressions
+        ])
+
+    def find_countermodel(self, premises, conclusion):
+        """
+        Look for a sampled countermodel when the prefilter is enabled.
+
+        Return the result of the operation with the countermodel found,
+        or only the verdict if only it is requested, or None to go on
+        with the exhaustive check.
+        """
+        if not self.prefilter:
+            return None
+
+        countermodel = Simulation.find_countermodel(premises, conclusion)
+        if countermodel is None:
+            return None
+
+        if not self.full_table:
+            return '[NAO]'
+        return '[NAO, [%s]]' % self.format_valuation(countermodel)
+
+    @classmethod
+    def format_valuation(cls, valuation):
+        """Format a valuation like {'p': True, 'q': False} as p=V,q=F."""
+        return ','.join(
+            '%s=%s' % (symbol, 'V' if value else 'F')
+            for symbol, value in sorted(valuation.items())
+        )
+
+    def uses_cache(self):
+        """
+        Check if the verdicts are reused from the cache, which is only
+        when the verdict alone is requested.
+        """
+        return self.cache is not None and not self.full_table and \
+            not self.cover
+
+    def get_known_consistency(self, expressions):
+        """
+        Get if the formulas are consistent from the cache, when it is
+        used.
+
+        Return None if it is not known.
+        """
+        if not self.uses_cache():
+            return None
+        return self.cache.is_consistent(expressions)
+
+    def store_consistency(self, expressions, consistent):
+        """Store if the formulas are consistent in the cache, if used."""
+        if self.uses_cache():
+            self.cache.store(expressions, consistent)
+
+    @classmethod
+    def negate(cls, expression):
+        """Get the negation of a formula."""
+        return Simplifier.build(Negation, cls.parse_formula(expression))
+
+    @classmethod
+    def parse_formula(cls, expression):
+        """Parse the expression, unless it is already a formula."""
+        return Interpreter.parse_expression(expression)
+
+    @classmethod
+    def is_knowledge_base_reference(cls, arg):
+        """Check if the arg references a declared knowledge base."""
+        return isinstance(arg, str) and \
+            arg.startswith(KnowledgeBaseDeclaration.REFERENCE)
+
+    def get_knowledge_base(self, reference):
+        """
+        Get a declared knowledge base by its reference (like '@base').
+
+        Raise KnowledgeBaseError if it is not declared, or the error of
+        its declaration if it was over the limits.
+        """
+        if self.knowledge_bases is None or \
+                reference not in self.knowledge_bases:
+            raise KnowledgeBaseError(
+                'Knowledge base "%s" not declared.' % reference
+            )
+        knowledge_base = self.knowledge_bases[reference]
+        if isinstance(knowledge_base, ResourceLimitExceeded):
+            raise type(knowledge_base)(
+                'Knowledge base "%s" over the limits: %s' % (
+                    reference, knowledge_base
+                )
+            )
+        return knowledge_base
+
 
 class SemanticStatus(Operation):
     """Verify the semantic status of a formula."""
 
     SYMBOL = 'S'
+    CHECKS = 2
 
     def perform(self, formula):
         """Check a formula semantic status."""
-        truth_table = TruthTable(formula)
+        if self.engine is not None:
+            return '[%s]' % self.decide(formula)
+
+        truth_table = TruthTable(formula, simplify=not self.full_table)
         valuations = truth_table.get_formula_valuations()
 
         formula_values = []
@@ -40,7 +259,7 @@ class SemanticStatus(Operation):
 
         status = self.check_status(formula_values)
 
-        return '[%s, [%s]]' % (status, truth_table.str_representation())
+        return self.build_result(status, truth_table)
 
     def check_status(self, formula_values):
         """Get the formulas semantic status based on its valuations."""
@@ -56,6 +275,18 @@ class SemanticStatus(Operation):
 
         return status
 
+    def get_expressions(self, formula):
+        """Get the formula."""
+        return [formula]
+
+    def decide(self, formula):
+        """Get the status from the models of the formula and its negation."""
+        if not self.is_satisfiable([formula]):
+            return "CONTRADICAO"
+        elif not self.is_satisfiable([self.negate(formula)]):
+            return "TAUTOLOGIA"
+        return "CONTINGENCIA"
+
 
 class SemanticEquivalence(Operation):
     """Verify if two formulas are semantic equivalent."""
@@ -64,17 +295,24 @@ class SemanticEquivalence(Operation):
 
     def perform(self, formula1, formula2):
         """Check if the two formulas are equivalent."""
+        result = self.get_early_result(formula1, formula2)
+        if result is not None:
+            return result
+
+        if self.engine is not None:
+            return '[%s]' % self.decide(formula1, formula2)
+
         quid_pro_quo, truth_table = self.check_equivalence(formula1, formula2)
         equivalent = 'SIM' if quid_pro_quo else 'NAO'
 
-        return '[%s, [%s]]' % (
-            equivalent,
-            truth_table.str_representation()
-        )
+        return self.build_result(equivalent, truth_table)
 
     def check_equivalence(self, formula1, formula2):
         """."""
-        truth_table = SetTruthTable([formula1, formula2])
+        truth_table = SetTruthTable(
+            [formula1, formula2],
+            simplify=not self.full_table
+        )
 
         formula1 = Interpreter.parse_expression(formula1)
         formula2 = Interpreter.parse_expression(formula2)
@@ -97,6 +335,33 @@ class SemanticEquivalence(Operation):
 
         return equivalent, truth_table
 
+    def get_expressions(self, formula1, formula2):
+        """Get the two formulas."""
+        return [formula1, formula2]
+
+    def decide_early(self, formula1, formula2):
+        """Get the sampled countermodel of the bi-implication, if any."""
+        return self.find_countermodel(
+            [], self.get_bi_implication(formula1, formula2)
+        )
+
+    def decide(self, formula1, formula2):
+        """
+        The formulas are equivalent if the negation of their bi-implication
+        has no model.
+        """
+        bi_implication = self.get_bi_implication(formula1, formula2)
+        equivalent = not self.is_satisfiable([self.negate(bi_implication)])
+        return 'SIM' if equivalent else 'NAO'
+
+    def get_bi_implication(self, formula1, formula2):
+        """Get the bi-implication of the formulas, true where they agree."""
+        return Simplifier.build(
+            BiImplication,
+            self.parse_formula(formula1),
+            self.parse_formula(formula2)
+        )
+
 
 class Consistency(Operation):
     """Verify if a set of formulas is consistent."""
@@ -105,15 +370,93 @@ class Consistency(Operation):
 
     def perform(self, formulas):
         """Check if the set of formulas is consistent."""
-        truth_table = SetTruthTable(formulas)
+        if formulas and self.is_knowledge_base_reference(formulas[0]):
+            knowledge_base = self.get_knowledge_base(formulas[0])
+            consistent = knowledge_base.is_consistent(formulas[1:])
+            return '[%s]' % ('SIM' if consistent else 'NAO')
+
+        if self.cover:
+            knowledge_base = KnowledgeBase([f for f in formulas if f])
+            consistent = 'SIM' if knowledge_base.models else 'NAO'
+            return self.build_cover_result(consistent, knowledge_base)
+
+        result = self.get_early_result(formulas)
+        if result is not None:
+            return result
+
+        if self.engine is not None:
+            consistent = self.decide(formulas)
+            self.store_verdict(formulas, consistent)
+            return '[%s]' % consistent
+
+        truth_table = SetTruthTable(formulas, simplify=not self.full_table)
         formulas_models = truth_table.get_formulas_set_models()
 
         consistent = 'SIM' if formulas_models else 'NAO'
+        self.store_verdict(formulas, consistent)
 
-        return '[%s, [%s]]' % (
-            consistent,
-            truth_table.str_representation()
-        )
+        return self.build_result(consistent, truth_table)
+
+    def get_expressions(self, formulas):
+        """
+        Get the set of formulas, with the premises of the knowledge base
+        it references.
+        """
+        if formulas and self.is_knowledge_base_reference(formulas[0]):
+            knowledge_base = self.get_knowledge_base(formulas[0])
+            return knowledge_base.premises + formulas[1:]
+        return formulas
+
+    def get_engines(self, formulas):
+        """The knowledge bases and the covers are evaluated over bitsets."""
+        if formulas and self.is_knowledge_base_reference(formulas[0]) or \
+                self.cover:
+            return [BitsetEngine]
+        return None
+
+    def decide_early(self, formulas):
+        """Get the verdict of the Horn or 2-CNF sets, or from the cache."""
+        if formulas and self.is_knowledge_base_reference(formulas[0]) or \
+                self.cover:
+            return None
+
+        consistent = self.decide_fragment(formulas)
+        if consistent is not None:
+            self.store_verdict(formulas, consistent)
+            return '[%s]' % consistent
+
+        consistent = self.get_known_verdict(formulas)
+        if consistent is not None:
+            return '[%s]' % consistent
+        return None
+
+    def decide(self, formulas):
+        """The set is consistent if its formulas have a common model."""
+        return 'SIM' if self.is_satisfiable(formulas) else 'NAO'
+
+    def get_known_verdict(self, formulas):
+        """Get the verdict from the cache, or None if it is not known."""
+        consistent = self.get_known_consistency([f for f in formulas if f])
+        if consistent is None:
+            return None
+        return 'SIM' if consistent else 'NAO'
+
+    def store_verdict(self, formulas, consistent):
+        """Store the verdict in the cache, if any."""
+        self.store_consistency([f for f in formulas if f], consistent == 'SIM')
+
+    def decide_fragment(self, formulas):
+        """
+        Get the verdict of Horn or 2-CNF formulas when only it is requested.
+
+        Return None if the verdict is to be decided otherwise.
+        """
+        if self.full_table or '' in formulas:
+            return None
+        consistent = FragmentSolver.is_satisfiable(formulas)
+        if consistent is None:
+            return None
+        return 'SIM' if consistent else 'NAO'
 
     def parse(self, line):
         """Parse a bracketed, comma separated formulas into a list."""
@@ -135,10 +478,34 @@ class LogicConsequence(Operation):
 
     def perform(self, formulas_set, formula):
         """Check if the formula is logic consequence of the formulas_set."""
+        if len(formulas_set) == 1 and \
+                self.is_knowledge_base_reference(formulas_set[0]):
+            knowledge_base = self.get_knowledge_base(formulas_set[0])
+            consequence = knowledge_base.entails(formula)
+            return '[%s]' % ('SIM' if consequence else 'NAO')
+
+        if self.cover:
+            # The cover is of the models of the set of formulas
+            knowledge_base = KnowledgeBase([f for f in formulas_set if f])
+            consequence = 'SIM' if knowledge_base.entails(formula) else 'NAO'
+            return self.build_cover_result(consequence, knowledge_base)
+
+        result = self.get_early_result(formulas_set, formula)
+        if result is not None:
+            return result
+
+        if self.engine is not None:
+            consequence = self.decide(formulas_set, formula)
+            self.store_verdict(formulas_set, formula, consequence)
+            return '[%s]' % consequence
+
         if '' in formulas_set and len(formulas_set) is 1:
             return self.is_logic_consequence_of_empty_set(formula)
 
-        truth_table = SetTruthTable(formulas_set + [formula])
+        truth_table = SetTruthTable(
+            formulas_set + [formula],
+            simplify=not self.full_table
+        )
         formula = Interpreter.parse_expression(formula)
 
         formulas = {}
@@ -158,15 +525,13 @@ class LogicConsequence(Operation):
                 break
 
         consequence = 'SIM' if logic_consequence else 'NAO'
+        self.store_verdict(formulas_set, formula, consequence)
 
-        return '[%s, [%s]]' % (
-            consequence,
-            truth_table.str_representation()
-        )
+        return self.build_result(consequence, truth_table)
 
     def is_logic_consequence_of_empty_set(self, formula):
         """Check if a formula is logic consequence of the empty set."""
-        truth_table = TruthTable(formula)
+        truth_table = TruthTable(formula, simplify=not self.full_table)
         valuations = truth_table.get_formula_valuations()
 
         logic_consequence = True
@@ -176,11 +541,108 @@ class LogicConsequence(Operation):
                 break
 
         consequence = 'SIM' if logic_consequence else 'NAO'
+        self.store_verdict([], formula, consequence)
 
-        return '[%s, [%s]]' % (
-            consequence,
-            truth_table.str_representation()
+        return self.build_result(consequence, truth_table)
+
+    def get_expressions(self, formulas_set, formula):
+        """
+        Get the set of formulas, or the premises of the knowledge base it
+        references, and the formula.
+        """
+        if len(formulas_set) == 1 and \
+                self.is_knowledge_base_reference(formulas_set[0]):
+            knowledge_base = self.get_knowledge_base(formulas_set[0])
+            return knowledge_base.premises + [formula]
+        return [f for f in formulas_set if f] + [formula]
+
+    def get_engines(self, formulas_set, formula):
+        """The knowledge bases and the covers are evaluated over bitsets."""
+        if len(formulas_set) == 1 and \
+                self.is_knowledge_base_reference(formulas_set[0]) or \
+                self.cover:
+            return [BitsetEngine]
+        return None
+
+    def decide_early(self, formulas_set, formula):
+        """
+        Get the verdict for Horn or 2-CNF premises, or the sampled
+        countermodel, or the verdict from the cache.
+        """
+        if len(formulas_set) == 1 and \
+                self.is_knowledge_base_reference(formulas_set[0]) or \
+                self.cover:
+            return None
+
+        consequence = self.decide_fragment(formulas_set, formula)
+        if consequence is not None:
+            self.store_verdict(formulas_set, formula, consequence)
+            return '[%s]' % consequence
+
+        countermodel = self.find_countermodel(
+            [f for f in formulas_set if f], formula
         )
+        if countermodel is not None:
+            self.store_verdict(formulas_set, formula, 'NAO')
+            return countermodel
+
+        consequence = self.get_known_verdict(formulas_set, formula)
+        if consequence is not None:
+            return '[%s]' % consequence
+        return None
+
+    def decide(self, formulas_set, formula):
+        """
+        The formula is logic consequence of the set if the set plus the
+        formula negation has no model.
+        """
+        formulas = self.get_refutation_set(formulas_set, formula)
+        return 'NAO' if self.is_satisfiable(formulas) else 'SIM'
+
+    def get_refutation_set(self, formulas_set, formula):
+        """Get the set plus the negation of the formula."""
+        return [f for f in formulas_set if f] + [self.negate(formula)]
+
+    def get_known_verdict(self, formulas_set, formula):
+        """
+        Get the verdict from the cache, or None if it is not known.
+
+        The formula is logic consequence of the set if the set plus the
+        formula negation is inconsistent.
+        """
+        if not self.uses_cache():
+            return None
+        consistent = self.get_known_consistency(
+            self.get_refutation_set(formulas_set, formula)
+        )
+        if consistent is None:
+            return None
+        return 'NAO' if consistent else 'SIM'
+
+    def store_verdict(self, formulas_set, formula, consequence):
+        """Store the verdict in the cache, if any."""
+        if not self.uses_cache():
+            return
+        self.store_consistency(
+            self.get_refutation_set(formulas_set, formula),
+            consequence == 'NAO'
+        )
+
+    def decide_fragment(self, formulas_set, formula):
+        """
+        Get the verdict for Horn or 2-CNF premises when only it is
+        requested.
+
+        Return None if the verdict is to be decided otherwise.
+        """
+        if self.full_table:
+            return None
+        consequence = FragmentSolver.entails(
+            [f for f in formulas_set if f], formula
+        )
+        if consequence is None:
+            return None
+        return 'SIM' if consequence else 'NAO'
 
     def parse(self, line):
         """Parse a bracketed, comma separated formulas into a list."""
@@ -197,3 +659,136 @@ class LogicConsequence(Operation):
         # The formula will be the last element in the list
         formula = args[-1]
         return [formulas_set, formula]
+
+
+class EquivalenceClasses(Operation):
+    """Partition a set of formulas in semantic equivalence classes."""
+
+    SYMBOL = 'EQC'
+
+    def perform(self, formulas):
+        """
+        Group the formulas that are semantically equivalent.
+
+        The formulas are first grouped by their values in a sample of
+        valuations, then only the groups of more than one formula are
+        split by their truth table columns, over the symbols of the group.
+        """
+        classes = []
+        for group in Simulation.group(formulas):
+            if len(group) == 1:
+                classes.append(group)
+            else:
+                classes.extend(Formula.get_equivalence_classes(group))
+
+        # Keep the classes in order of appearance
+        positions = {}
+        for position, formula in enumerate(formulas):
+            positions.setdefault(formula, position)
+        classes.sort(key=lambda formulas_class: positions[formulas_class[0]])
+        return '[%s]' % ', '.join(
+            '[%s]' % ','.join(str(formula) for formula in formulas_class)
+            for formulas_class in classes
+        )
+
+    def parse(self, line):
+        """Parse a bracketed, comma separated formulas into a list."""
+        # Remove the whitespaces, the operation symbol and the comma after it
+        line = "".join(line.split())[len(self.SYMBOL) + 1:]
+        # Remove the brackets of the string
+        line = line.replace('[', '').replace(']', '')
+        # Split the line on comma to get all formulas of the set as list
+        args = [arg for arg in line.split(',') if arg]
+        return [args]
+
+    def get_expressions(self, formulas):
+        """Get the formulas."""
+        return formulas
+
+    def get_engines(self, formulas):
+        """The formulas are evaluated over bitsets."""
+        return [BitsetEngine]
+
+
+class KnowledgeBaseDeclaration(Operation):
+    """
+    Declare a named set of premises to be queried by the next lines.
+
+    A line like '[KB, @base, [p->q, q->r]]' declares the knowledge base
+    '@base', then '[CL, @base, p->r]' checks if a formula is logic
+    consequence of the premises and '[C, @base, -r]' checks if the
+    premises plus some formulas are consistent. The premises are
+    evaluated only once, in the declaration, and stored in the
+    knowledge_bases dict of the run. A declaration over the limits
+    stores its error instead, so the lines referencing it are over the
+    limits too.
+    """
+
+    SYMBOL = 'KB'
+    REFERENCE = '@'
+
+    def perform(self, reference, formulas):
+        """Evaluate and store the premises, it has no result."""
+        self.check_reference(reference)
+        self.knowledge_bases[reference] = KnowledgeBase(formulas)
+
+    def reject(self, error, reference, formulas):
+        """Store the error of the declaration over the limits."""
+        self.check_reference(reference)
+        self.knowledge_bases[reference] = error
+
+    def check_reference(self, reference):
+        """Check that the reference can be declared."""
+        if not self.is_knowledge_base_reference(reference):
+            raise KnowledgeBaseError(
+                'Invalid knowledge base name "%s".' % reference
+            )
+        if self.knowledge_bases is None:
+            raise KnowledgeBaseError(
+                'No knowledge bases dict to declare "%s".' % reference
+            )
+
+    def get_expressions(self, reference, formulas):
+        """Get the premises."""
+        return formulas
+
+    def get_engines(self, reference, formulas):
+        """The premises are evaluated over bitsets."""
+        return [BitsetEngine]
+
+    def parse(self, line):
+        """Parse the reference and the bracketed set of premises."""
+        # Remove the whitespaces and the operation symbol from the line
+        line = "".join(line.split())[len(self.SYMBOL) + 1:]
+        reference, formulas = line.split(',', 1)
+        # Remove the brackets of the string
+        formulas = formulas.replace('[', '').replace(']', '')
+        return [reference, [f for f in formulas.split(',') if f]]
+
+
+class ModelCount(Operation):
+    """Count the valuations that satisfy a formula or a set of formulas."""
+
+    SYMBOL = '#'
+
+    def perform(self, formulas):
+        """Count the models of the set of formulas."""
+        return '[%d]' % Formula.count_set_models(formulas)
+
+    def get_expressions(self, formulas):
+        """Get the formulas."""
+        return formulas
+
+    def get_engines(self, formulas):
+        """The models are counted by search."""
+        return [CountingEngine]
+
+    def parse(self, line):
+        """Parse a formula or a bracketed set of formulas into a list."""
+        # Remove the operation symbol and the comma after it
+        line = "".join(line.split())[len(self.SYMBOL) + 1:]
+        # Remove the brackets of the string
+        line = line.replace('[', '').replace(']', '')
+        # Split the line on comma to get all formulas of the set as list
+        args = [arg for arg in line.split(',') if arg]
+        return [args]
@@ -1,51 +1,397 @@
 """Parse the input file and delegate the treatment."""
 
+import argparse
+import os
 from os import path
 import re
 import sys
+import time
 
-from handler import OperationHandler
+from checkpoint import Checkpoint
+from handler import OperationHandler, Limits
+from metrics import Metrics
+from shards import Shard, ErrorListing, ShardErrorListing
+from lp.engines import ResourceLimitExceeded
+from lp.entailment import EntailmentCache
+from lp.interpreter import TruthTable
+from operations import KnowledgeBaseError
 
 
-# The filename should be the first argument
-input_file = sys.argv[1]
-# The result filename should be the second argument
-try:
-    result_file = sys.argv[2]
-except IndexError:
-    result_file = 'results.txt'
+# Regexp to match only the accepted characters
+pattern = re.compile(r'^\[([a-z0-9SEQCLKB#@, &\-\|><\(\)\[\]]*)\]$')
 
-if not path.isfile(input_file):
-    raise Exception('File not found.')
+# Regexp to match a knowledge base reference right after its operation,
+# the only place where it is accepted
+reference_pattern = re.compile(r'^(KB|C|CL),\[?@[a-z0-9]+(,|\]|$)')
 
-# Load each line of the file to a list
-with open(input_file) as file:
-    entries = [entry.strip() for entry in file if entry is not '\n']
+# Size of the read and write buffers
+BUFFER_SIZE = 2**20
 
-# Regexp to match only the accepted characters
-pattern = re.compile(r'^\[([a-z0-9SEQCL, &\-\|><\(\)\[\]]*)\]$')
+# Multipliers of the memory sizes units
+SIZE_UNITS = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+
+
+def parse_size(size):
+    """Parse a memory size like '512M' or '2G' into bytes."""
+    matches = re.match(r'^([0-9]+)([KMGT]?)B?$', size.strip().upper())
+    if not matches:
+        raise argparse.ArgumentTypeError('invalid size "%s"' % size)
+    quantity, unit = matches.groups()
+    return int(quantity) * SIZE_UNITS[unit]
+
+
+def parse_limit(value_type):
+    """
+    Get a parser of limits like '10' or 'EQ=10', for an operation.
+
+    The parsed limit is a tuple (operation, value), where the operation
+    is None when it is not given.
+    """
+    def parse(limit):
+        operation, _, value = limit.rpartition('=')
+        return operation or None, value_type(value)
+    return parse
+
+
+def parse_shard(shard):
+    """Parse a shard like '0/4' (the first of four shards)."""
+    matches = re.match(r'^([0-9]+)/([0-9]+)$', shard.strip())
+    if not matches or not 0 <= int(matches.group(1)) < int(matches.group(2)):
+        raise argparse.ArgumentTypeError('invalid shard "%s"' % shard)
+    return Shard(int(matches.group(1)), int(matches.group(2)))
+
+
+def build_limits(time_limits, memory_budgets):
+    """Build the limits of the operations from the parsed arguments."""
+    limits = Limits()
+    for name, values in (('time_limit', time_limits),
+                         ('memory_budget', memory_budgets)):
+        for operation, value in values or ():
+            limits.set(operation, **{name: value})
+    return limits
+
+
+def read_entries(input_file):
+    """
+    Read the entries of the input file one by one.
 
-lines_with_error = []
-results = []
-for entry in entries:
+    The input file '-' is the standard input.
+    Yield each entry with the input offset right after it.
+    """
+    if input_file == '-':
+        file = sys.stdin.buffer
+    else:
+        file = open(input_file, 'rb', buffering=BUFFER_SIZE)
+
+    offset = 0
+    try:
+        for entry in file:
+            offset += len(entry)
+            if entry != b'\n':
+                yield entry.decode().strip(), offset
+    finally:
+        if file is not sys.stdin.buffer:
+            file.close()
+
+
+def parse_entry(entry):
+    """Get the line of an entry, or None if it is not valid."""
     matches = pattern.match(entry)
-    if matches:
-        line = matches.groups()[0]
-        # Removing all whitespaces
-        line = "".join(line.split())
-        result = OperationHandler.handle(line)
-        results.append(result)
+    if not matches:
+        return None
+    line = matches.groups()[0]
+    # Removing all whitespaces
+    line = "".join(line.split())
+    if not is_valid_line(line):
+        return None
+    return line
+
+
+def is_valid_line(line):
+    """
+    Check the characters of a line that are accepted in some places only.
+
+    The uppercase letters and the # are only accepted in the operation
+    symbol, and the knowledge base references right after the operations
+    taking one.
+    """
+    operation, _, args = line.partition(',')
+    if operation not in OperationHandler.OPERATIONS or \
+            re.search(r'[A-Z#]', args):
+        return False
+    if '@' in args:
+        return args.count('@') == 1 and \
+            reference_pattern.match(line) is not None
+    return True
+
+
+def process(entries, results_file, errors_file, flush_every,
+            checkpoint=None, input_offset=0, output_offset=0, shard=None,
+            **options):
+    """
+    Handle each entry and write its result as soon as it is ready.
+
+    The results file is flushed every flush_every entries, so only
+    one entry at a time is kept in memory. With a checkpoint, the
+    progress is saved at each flush, and the entries before input_offset
+    are skipped, as their results are already in the first output_offset
+    bytes of the results file. With a shard, only its entries are
+    handled and the results and errors are tagged to be merged (see
+    shards.py). The metrics, if any, are counted and exported as they
+    are due, with the time taken by each line, retries included.
+    """
+    metrics = options.get('metrics')
+    if shard is None:
+        error_listing = ErrorListing(errors_file)
     else:
-        lines_with_error.append(entry)
-
-# Save the results in the results.txt file
-with open(result_file, 'w') as results_file:
-    for result in results:
-        if result is not None:
-            results_file.write(result)
-            results_file.write('\n')
-
-if lines_with_error:
-    print('Lines with error (not parsed):')
-    for line in lines_with_error:
-        print(line)
+        error_listing = ShardErrorListing(errors_file)
+    pending = 0
+    for entry, offset in entries:
+        line = parse_entry(entry)
+
+        if offset <= input_offset or \
+                shard is not None and not shard.contains(entry):
+            # Processed by the interrupted run or by another shard, but
+            # the next lines may need its declarations
+            if line is not None and OperationHandler.is_declaration(line):
+                try:
+                    OperationHandler.handle_within_limits(
+                        line, **dict(options, metrics=None)
+                    )
+                except (ResourceLimitExceeded, KnowledgeBaseError):
+                    # Reported by the run that processed the line
+                    pass
+            continue
+
+        if metrics is not None:
+            metrics.lines += 1
+            metrics.export_if_due()
+
+        valid = line is not None
+        if valid:
+            report = {} if metrics is not None else None
+            start = time.time()
+            try:
+                result = OperationHandler.handle_within_limits(
+                    line, report=report, **options
+                )
+            except ResourceLimitExceeded as error:
+                error_listing.add_rejected(offset, entry, error)
+                result = None
+            except KnowledgeBaseError:
+                # Reported as a line with error, the next lines go on
+                valid = False
+                result = None
+            if metrics is not None:
+                metrics.observe_operation(
+                    line.split(',')[0], time.time() - start, **report
+                )
+            if result is not None:
+                if shard is not None:
+                    result = shard.tag(offset, result)
+                results_file.write(result)
+                results_file.write('\n')
+                output_offset += len(result) + 1
+                if metrics is not None:
+                    metrics.bytes_written += len(result) + 1
+
+        if not valid:
+            if metrics is not None:
+                metrics.parse_errors += 1
+            error_listing.add_error(offset, entry)
+
+        pending += 1
+        if pending >= flush_every:
+            save_progress(results_file, checkpoint, offset, output_offset)
+            pending = 0
+
+    results_file.flush()
+
+
+def save_progress(results_file, checkpoint, input_offset, output_offset):
+    """Flush the results file and save the checkpoint, if any."""
+    results_file.flush()
+    if checkpoint is not None:
+        os.fsync(results_file.fileno())
+        checkpoint.save(input_offset, output_offset)
+
+
+def main(args=None):
+    """Run the program with the command line arguments."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        'input_file',
+        help='the file with the operations, or - for the standard input'
+    )
+    arg_parser.add_argument(
+        'result_file', nargs='?', default='results.txt',
+        help='the file to write the results, or - for the standard output'
+    )
+    arg_parser.add_argument(
+        '--flush-every', type=int, default=1000, metavar='N',
+        help='flush the results file every N lines'
+    )
+    arg_parser.add_argument(
+        '--verdict-only', action='store_true',
+        help='write only the verdicts, without the truth tables'
+    )
+    arg_parser.add_argument(
+        '--format', default='text',
+        choices=('text',) + TruthTable.COMPACT_ENCODINGS,
+        help='the truth tables format: text, or each column as a bitset '
+             'in hexadecimal or base64 (see decoder.py)'
+    )
+    arg_parser.add_argument(
+        '--memory-budget', type=parse_limit(parse_size), action='append',
+        metavar='[OPERATION=]SIZE',
+        help='the lines whose evaluation is estimated to use more memory '
+             'than SIZE (like 512M or 2G) are over the limits; it can be '
+             'given for each operation, like EQ=512M'
+    )
+    arg_parser.add_argument(
+        '--time-limit', type=parse_limit(float), action='append',
+        metavar='[OPERATION=]SECONDS',
+        help='the lines that take more than SECONDS are over the limits; '
+             'it can be given for each operation, like EQ=1.5'
+    )
+    arg_parser.add_argument(
+        '--on-limit', default=OperationHandler.SKIP,
+        choices=(OperationHandler.SKIP, OperationHandler.MARK,
+                 OperationHandler.RETRY),
+        help='what to do with the lines over the limits: skip them (they '
+             'are reported with the errors), mark them in the results, or '
+             'retry them giving only the verdict'
+    )
+    arg_parser.add_argument(
+        '--prefilter', action='store_true',
+        help='look for a countermodel of the EQ and CL lines in a sample '
+             'of valuations first, and answer NAO with it when found'
+    )
+    arg_parser.add_argument(
+        '--cover', action='store_true',
+        help='write the models of the C and CL lines as a cover of cubes '
+             '(partial valuations) instead of their truth tables'
+    )
+    arg_parser.add_argument(
+        '--cache', action='store_true',
+        help='with --verdict-only, reuse the verdicts of the C and CL '
+             'lines for the next lines over subsets or supersets of their '
+             'formulas'
+    )
+    arg_parser.add_argument(
+        '--checkpoint', metavar='FILE',
+        help='save the progress in FILE at each flush, and resume from it '
+             'if it exists, appending to the results file'
+    )
+    arg_parser.add_argument(
+        '--metrics-json', metavar='FILE',
+        help='write the throughput and latency metrics of the run to FILE '
+             'as JSON'
+    )
+    arg_parser.add_argument(
+        '--metrics-prometheus', metavar='FILE',
+        help='write the metrics of the run to FILE in the Prometheus text '
+             'format'
+    )
+    arg_parser.add_argument(
+        '--metrics-interval', type=float, default=60, metavar='SECONDS',
+        help='also write the metrics every SECONDS during the run'
+    )
+    arg_parser.add_argument(
+        '--shard', type=parse_shard, metavar='I/N',
+        help='process only the lines of the shard I of N (from 0), '
+             'assigned by their text; the results of all the shards are '
+             'put together by merge.py'
+    )
+    args = arg_parser.parse_args(args)
+
+    if args.cache and not args.verdict_only:
+        arg_parser.error('--cache needs --verdict-only')
+
+    if args.input_file != '-' and not path.isfile(args.input_file):
+        raise Exception('File not found.')
+
+    if args.checkpoint and '-' in (args.input_file, args.result_file):
+        raise Exception('A checkpoint needs an input and a results file.')
+
+    options = {
+        'table_format': args.format,
+        'limits': build_limits(args.time_limit, args.memory_budget),
+        'on_limit': args.on_limit,
+        'prefilter': args.prefilter,
+        'cover': args.cover,
+        # The knowledge bases declared in the run
+        'knowledge_bases': {},
+    }
+    if args.verdict_only:
+        options['full_table'] = False
+    if args.shard:
+        options['shard'] = args.shard
+    if args.cache:
+        options['cache'] = EntailmentCache()
+
+    metrics = None
+    if args.metrics_json or args.metrics_prometheus:
+        metrics = Metrics(args.metrics_json, args.metrics_prometheus,
+                          args.metrics_interval)
+        options['metrics'] = metrics
+
+    try:
+        run(args, options)
+    finally:
+        if metrics is not None:
+            metrics.export()
+
+
+def run(args, options):
+    """Process the input file with the given operation options."""
+    entries = read_entries(args.input_file)
+    if args.result_file == '-':
+        # The lines with error must not be mixed with the results
+        write_header(sys.stdout, args.shard)
+        process(entries, sys.stdout, sys.stderr, args.flush_every,
+                **options)
+        return
+
+    checkpoint = None
+    input_offset = output_offset = 0
+    mode = 'w'
+    if args.checkpoint:
+        checkpoint = Checkpoint(
+            args.checkpoint, args.input_file, args.result_file
+        )
+        input_offset, output_offset = checkpoint.load()
+        if input_offset and path.isfile(args.result_file):
+            mode = 'r+'
+        else:
+            input_offset = output_offset = 0
+
+    with open(args.result_file, mode, buffering=BUFFER_SIZE) \
+            as results_file:
+        # Drop the results written after the last checkpoint
+        results_file.truncate(output_offset)
+        results_file.seek(output_offset)
+        if not output_offset:
+            output_offset = write_header(results_file, args.shard)
+        process(entries, results_file, sys.stdout, args.flush_every,
+                checkpoint, input_offset, output_offset, **options)
+
+    if checkpoint is not None:
+        checkpoint.remove()
+
+
+def write_header(results_file, shard):
+    """
+    Write the header of the results of a shard, if any.
+
+    Return the size of the header.
+    """
+    if shard is None:
+        return 0
+    header = shard.get_header()
+    results_file.write(header + '\n')
+    return len(header) + 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Split a run in shards and merge their results back."""
+
+import heapq
+import json
+import zlib
+
+
+class Shard:
+    """
+    One of the parts of a run spread over many processes or machines.
+
+    Each entry of the input goes to the shard given by the checksum of
+    its text, so the assignment does not depend on the order of the
+    lines. The results of a shard are tagged with the input offset of
+    their entries, so merge_results can put them back in order.
+    """
+
+    # First line of the results file of a shard
+    HEADER = 'shard %d/%d'
+
+    def __init__(self, index, quantity):
+        """Create the shard index of quantity shards."""
+        if not 0 <= index < quantity:
+            raise Exception('Invalid shard %d/%d.' % (index, quantity))
+        self.index = index
+        self.quantity = quantity
+
+    def contains(self, entry):
+        """Check if the entry is assigned to this shard."""
+        return zlib.crc32(entry.encode()) % self.quantity == self.index
+
+    def get_header(self):
+        """Get the header of the results file of the shard."""
+        return self.HEADER % (self.index, self.quantity)
+
+    @classmethod
+    def tag(cls, offset, result):
+        """Tag a result with the input offset of its entry."""
+        return '%d %s' % (offset, result)
+
+    @classmethod
+    def read_header(cls, header):
+        """Get the (index, quantity) of a shard from its header."""
+        try:
+            index, quantity = header.split(' ', 1)[1].split('/')
+            return int(index), int(quantity)
+        except (IndexError, ValueError):
+            raise Exception('Invalid shard header "%s".' % header.strip())
+
+
+class ErrorListing:
+    """Report the lines with error and the lines over the limits."""
+
+    def __init__(self, errors_file):
+        """Report to the given file."""
+        self.errors_file = errors_file
+        self.has_errors = False
+
+    def add_rejected(self, offset, entry, error):
+        """Report a line over the limits."""
+        print('Line rejected: %s' % entry, file=self.errors_file)
+        print(error, file=self.errors_file)
+
+    def add_error(self, offset, entry):
+        """Report a line with error, after a header for the first one."""
+        if not self.has_errors:
+            print('Lines with error (not parsed):', file=self.errors_file)
+            self.has_errors = True
+        print(entry, file=self.errors_file)
+
+
+class ShardErrorListing(ErrorListing):
+    """
+    Report the errors of a shard, to be merged with the other shards.
+
+    Each error is a JSON record with the input offset of its entry.
+    """
+
+    def add_rejected(self, offset, entry, error):
+        """Record a line over the limits."""
+        self.add_record(offset=offset, entry=entry, rejection=str(error))
+
+    def add_error(self, offset, entry):
+        """Record a line with error."""
+        self.add_record(offset=offset, entry=entry)
+
+    def add_record(self, **record):
+        """Write an error record."""
+        print(json.dumps(record), file=self.errors_file)
+
+
+def merge_results(shard_files, results_file):
+    """
+    Write the results of all the shards in the order of the input.
+
+    Raise an exception if the shards are not all the parts of one run.
+    """
+    shards = set()
+    quantities = set()
+    for shard_file in shard_files:
+        index, quantity = Shard.read_header(shard_file.readline())
+        if index in shards:
+            raise Exception('Shard %d/%d given twice.' % (index, quantity))
+        shards.add(index)
+        quantities.add(quantity)
+
+    if len(quantities) > 1 or shards != set(range(quantities.pop())):
+        raise Exception('The shards are not all the parts of one run.')
+
+    for _, result in heapq.merge(
+        *(read_results(shard_file) for shard_file in shard_files)
+    ):
+        results_file.write(result)
+
+
+def merge_errors(error_files, errors_file):
+    """Report the errors of all the shards as a single run does."""
+    listing = ErrorListing(errors_file)
+    records = heapq.merge(
+        *(map(json.loads, error_file) for error_file in error_files),
+        key=lambda record: record['offset']
+    )
+    for record in records:
+        if 'rejection' in record:
+            listing.add_rejected(
+                record['offset'], record['entry'], record['rejection']
+            )
+        else:
+            listing.add_error(record['offset'], record['entry'])
+
+
+def read_results(shard_file):
+    """Yield the (offset, result) of the tagged results of a shard."""
+    for line in shard_file:
+        offset, result = line.split(' ', 1)
+        yield int(offset), result
@@ -0,0 +1,99 @@
+"""Check that a resumed run gives the results of an uninterrupted one."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import parser
+from handler import OperationHandler
+
+
+LINES = [
+    '[KB, @base, [p->q, q->r]]',
+    '[S, p123 -> (q20 & r | -r1)]',
+    '[C, [p|s, s<->-q, p->q]]',
+    # Not handled
+    'not a line',
+    '[EQ, p -> q, -p | q]',
+    '[CL, [-r -> (p|q), r&-q], r->q]',
+    '[CL, @base, p->r]',
+    '[#, [p|q, q->r]]',
+    '[C, @base, p, -r]',
+    '[EQC, [p->q, -p|q, p&q, -(-p|-q)]]',
+]
+
+
+class Interrupted(Exception):
+    """Raised to interrupt a run."""
+
+
+class CheckpointTest(unittest.TestCase):
+    """Interrupt a run and resume it from its checkpoint."""
+
+    def setUp(self):
+        """Write the input file in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_file = self.get_path('input.txt')
+        with open(self.input_file, 'w') as file:
+            file.write('\n'.join(LINES) + '\n')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def get_path(self, name):
+        """Get the path of a file in the temporary directory."""
+        return os.path.join(self.directory.name, name)
+
+    def run_parser(self, *args):
+        """Run the parser, with the errors written to a string."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser.main([self.input_file] + list(args))
+
+    def read(self, name):
+        """Read a file of the temporary directory."""
+        with open(self.get_path(name)) as file:
+            return file.read()
+
+    def test_resume(self):
+        """The results of the interrupted run are completed exactly."""
+        self.run_parser(self.get_path('clean.txt'))
+
+        # Interrupt it before each handled line but the first one
+        for handled_lines in range(1, len(LINES) - 1):
+            results_file = self.get_path('results%d.txt' % handled_lines)
+            checkpoint_file = self.get_path('checkpoint%d' % handled_lines)
+            args = [results_file, '--checkpoint', checkpoint_file,
+                    '--flush-every', '2']
+            self.interrupt(handled_lines, args)
+            # The progress is saved every two entries, the first one
+            # being the knowledge base replayed on resume
+            self.assertEqual(os.path.isfile(checkpoint_file),
+                             handled_lines >= 2)
+
+            self.run_parser(*args)
+            self.assertEqual(self.read(results_file), self.read('clean.txt'))
+            self.assertFalse(os.path.isfile(checkpoint_file))
+
+    def interrupt(self, handled_lines, args):
+        """Run the parser until it handled some lines."""
+        handle = OperationHandler.handle
+        calls = []
+
+        def interrupted_handle(line, **options):
+            calls.append(line)
+            if len(calls) > handled_lines:
+                raise Interrupted()
+            return handle(line, **options)
+
+        with mock.patch.object(OperationHandler, 'handle',
+                               side_effect=interrupted_handle):
+            with self.assertRaises(Interrupted):
+                self.run_parser(*args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Check that the compact tables decode to the text tables."""
+
+import unittest
+
+from decoder import decode_line
+from lp.interpreter import TruthTable, SetTruthTable
+
+
+class DecoderTest(unittest.TestCase):
+    """Compare the decoded compact tables with the text ones."""
+
+    EXPRESSIONS = [
+        'p',
+        'p->q',
+        '-(p&q)<->(-p|-q)',
+        # 512 rows, more than the 256 small integers cached by Python
+        'a&b&c&d&e&f&g&h&i',
+    ]
+
+    def test_decode_compact_representation(self):
+        """Decode each compact table back to its text."""
+        for expression in self.EXPRESSIONS:
+            truth_table = TruthTable(expression)
+            text = truth_table.str_representation()
+            for encoding in TruthTable.COMPACT_ENCODINGS:
+                compact = truth_table.compact_representation(encoding)
+                self.assertEqual(
+                    TruthTable.decode_compact_representation(compact), text
+                )
+
+    def test_decode_line(self):
+        """Decode the tables of result lines."""
+        truth_table = SetTruthTable(['a|b|c|d|e|f|g|h|i', 'a->b'])
+        text = '[SIM, [%s]]' % truth_table.str_representation()
+        for encoding in TruthTable.COMPACT_ENCODINGS:
+            line = '[SIM, [%s]]' % truth_table.compact_representation(
+                encoding
+            )
+            self.assertEqual(decode_line(line + '\n'), text + '\n')
+
+    def test_text_representation_end(self):
+        """The last line of a large table has no separator after it."""
+        text = TruthTable('a&b&c&d&e&f&g&h&i').str_representation()
+        self.assertTrue(text.endswith(',F]]'))
+
+
+if __name__ == '__main__':
+    unittest.main()
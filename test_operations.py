@@ -0,0 +1,86 @@
+"""Check how the operations are admitted and decided by the handler."""
+
+import unittest
+from unittest import mock
+
+from handler import OperationHandler
+from lp.entailment import EntailmentCache
+from operations import Consistency, LogicConsequence
+
+
+class EarlyResultTest(unittest.TestCase):
+    """Handle lines decided before choosing the engine."""
+
+    def test_fragment_decided_once(self):
+        """The Horn and 2-CNF sets are checked once per line."""
+        for operation, line, result in [
+            (Consistency, 'C,[p->q,p,-q]', '[NAO]'),
+            (LogicConsequence, 'CL,[p->q,q->r],p->r', '[SIM]'),
+        ]:
+            with mock.patch.object(
+                operation, 'decide_fragment', autospec=True,
+                side_effect=operation.decide_fragment
+            ) as decide_fragment:
+                self.assertEqual(
+                    OperationHandler.handle(line, full_table=False), result
+                )
+            self.assertEqual(decide_fragment.call_count, 1)
+
+    def test_cache_looked_up_once(self):
+        """The cache is looked up once per line, hit or miss."""
+        cache = EntailmentCache()
+        for operation, line, result in [
+            (Consistency, 'C,[p|q|r,-p,-q]', '[SIM]'),
+            (LogicConsequence, 'CL,[p|q|r,-p],q|r', '[SIM]'),
+        ]:
+            # The first line misses the cache and the second one hits it
+            for _ in range(2):
+                with mock.patch.object(
+                    operation, 'get_known_verdict', autospec=True,
+                    side_effect=operation.get_known_verdict
+                ) as get_known_verdict:
+                    self.assertEqual(
+                        OperationHandler.handle(
+                            line, full_table=False, cache=cache
+                        ),
+                        result
+                    )
+                self.assertEqual(get_known_verdict.call_count, 1)
+
+    def test_cache_unused_with_tables(self):
+        """Nothing is stored in a cache that is not read."""
+        cache = EntailmentCache()
+        OperationHandler.handle('C,[p|q|r,-p,-q]', cache=cache)
+        OperationHandler.handle('CL,[p|q|r,-p],q|r', cache=cache)
+        self.assertEqual(cache.consistent + cache.inconsistent, [])
+
+    def test_prefilter_verdict_only(self):
+        """The sampled countermodel is given only with the full output."""
+        line = 'EQ,p&q,p'
+        self.assertEqual(
+            OperationHandler.handle(line, full_table=False, prefilter=True),
+            '[NAO]'
+        )
+        self.assertEqual(
+            OperationHandler.handle(line, prefilter=True),
+            '[NAO, [p=V,q=F]]'
+        )
+
+
+class CoverTest(unittest.TestCase):
+    """Handle lines giving the cover of the models."""
+
+    def test_cover_admitted_by_bitset_cost(self):
+        """The cover fits in budgets too small for the truth table."""
+        symbols = ['a%d' % index for index in range(14)]
+        line = 'C,[%s]' % '|'.join(symbols)
+        result = OperationHandler.handle(
+            line, cover=True, memory_budget=2**20
+        )
+        self.assertEqual(result, '[SIM, [%s]]' % ', '.join(
+            '[%s=V]' % symbol for symbol in sorted(symbols)
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Check how the parser handles a batch of lines."""
+
+import contextlib
+import io
+import unittest
+
+from handler import Limits, OperationHandler
+from parser import main, process
+
+
+def get_entries(lines):
+    """Get the entries of the lines, with the offsets after them."""
+    entries = []
+    offset = 0
+    for line in lines:
+        offset += len(line) + 1
+        entries.append((line, offset))
+    return entries
+
+
+def run_lines(lines, **options):
+    """Process the lines, return the results and the errors written."""
+    results_file = io.StringIO()
+    errors_file = io.StringIO()
+    options.setdefault('knowledge_bases', {})
+    process(get_entries(lines), results_file, errors_file, 1000, **options)
+    return results_file.getvalue(), errors_file.getvalue()
+
+
+class KnowledgeBaseTest(unittest.TestCase):
+    """Process the lines declaring and querying knowledge bases."""
+
+    LINES = [
+        '[KB, @b, [p1->p2, p2->p3, p3&p4&p5&p6&p7&p8&p9&p10&p11&p12]]',
+        '[CL, @b, p1->p3]',
+        '[S, p]',
+    ]
+
+    def test_declaration_over_the_budget(self):
+        """The queries of a rejected declaration are rejected too."""
+        limits = Limits()
+        limits.set('KB', memory_budget=100)
+        results, errors = run_lines(self.LINES, limits=limits)
+        self.assertEqual(results, '[CONTINGENCIA, [[p], [[V], [F]]]]\n')
+        self.assertIn('Line rejected: %s' % self.LINES[0], errors)
+        self.assertIn('Line rejected: %s' % self.LINES[1], errors)
+        self.assertIn('Knowledge base "@b" over the limits', errors)
+
+    def test_declaration_marked(self):
+        """The queries of a marked declaration are marked too."""
+        limits = Limits()
+        limits.set('KB', memory_budget=100)
+        results, _ = run_lines(
+            self.LINES, limits=limits, on_limit=OperationHandler.MARK
+        )
+        self.assertEqual(results.splitlines(), [
+            '[MEMORIA_ESGOTADA]',
+            '[MEMORIA_ESGOTADA]',
+            '[CONTINGENCIA, [[p], [[V], [F]]]]',
+        ])
+
+    def test_undeclared_reference(self):
+        """A query of an undeclared knowledge base is a line with error."""
+        results, errors = run_lines(['[CL, @nope, p]', '[S, p]'])
+        self.assertEqual(results, '[CONTINGENCIA, [[p], [[V], [F]]]]\n')
+        self.assertEqual(
+            errors, 'Lines with error (not parsed):\n[CL, @nope, p]\n'
+        )
+
+
+class LineValidationTest(unittest.TestCase):
+    """List the lines with characters in the wrong place as errors."""
+
+    def test_misplaced_references(self):
+        """The references are accepted right after their operation only."""
+        results, errors = run_lines([
+            '[KB, @b, [p]]', '[C, [p, @b]]', '[C, @b, -p]', '[S, p@b]',
+            '[S, pKB]', '[SS, p]',
+        ])
+        self.assertEqual(results, '[NAO]\n')
+        self.assertEqual(errors.splitlines(), [
+            'Lines with error (not parsed):',
+            '[C, [p, @b]]',
+            '[S, p@b]',
+            '[S, pKB]',
+            '[SS, p]',
+        ])
+
+    def test_misplaced_model_count_symbol(self):
+        """The # is accepted as the operation symbol only."""
+        results, errors = run_lines(['[S, p#q]', '[#, [p|q]]', '[#, #]'])
+        self.assertEqual(results, '[3]\n')
+        self.assertEqual(errors.splitlines(), [
+            'Lines with error (not parsed):', '[S, p#q]', '[#, #]',
+        ])
+
+
+class ArgumentsTest(unittest.TestCase):
+    """Check the command line arguments."""
+
+    def test_cache_without_verdict_only(self):
+        """The cache is only read when only the verdicts are requested."""
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            with self.assertRaises(SystemExit):
+                main(['input.txt', '--cache'])
+        self.assertIn('--cache needs --verdict-only', errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Check that the merged shards give the results of a single run."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+LINES = [
+    '[KB, @base, [p->q, q->r]]',
+    '[S, p123 -> (q20 & r | -r1)]',
+    '[CL, @base, p->r]',
+    '[S, p#q]',
+    '[C, [p|s, s<->-q, p->q]]',
+    '[C, @base, p, -r]',
+    # Over the memory budget
+    '[S, %s]' % '&'.join('a%d' % index for index in range(20)),
+    '[EQ, p -> q, -p | q]',
+    'not a line',
+    '[CL, [-r -> (p|q), r&-q], r->q]',
+    '[#, [p|q, q->r]]',
+    '[EQC, [p->q, -p|q, p&q, -(-p|-q)]]',
+    '[CL, @nope, p]',
+    '[C, @base, -p]',
+]
+
+
+def run_script(script, *args):
+    """Run a script of the repository, return its standard output."""
+    return subprocess.run(
+        [sys.executable, '-W', 'ignore', os.path.join(DIRECTORY, script)] +
+        list(args),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        universal_newlines=True
+    ).stdout
+
+
+class ShardsTest(unittest.TestCase):
+    """Run the shards as separate processes and merge them."""
+
+    SHARDS = 3
+
+    def setUp(self):
+        """Write the input file in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_file = self.get_path('input.txt')
+        with open(self.input_file, 'w') as file:
+            file.write('\n'.join(LINES) + '\n')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def get_path(self, name):
+        """Get the path of a file in the temporary directory."""
+        return os.path.join(self.directory.name, name)
+
+    def run_shards(self):
+        """Run each shard, return their results and errors files."""
+        shard_files = []
+        error_files = []
+        for index in range(self.SHARDS):
+            shard_file = self.get_path('results%d.txt' % index)
+            error_file = self.get_path('errors%d.txt' % index)
+            errors = run_script(
+                'parser.py', self.input_file, shard_file,
+                '--shard', '%d/%d' % (index, self.SHARDS),
+                '--memory-budget', '1M'
+            )
+            with open(error_file, 'w') as file:
+                file.write(errors)
+            shard_files.append(shard_file)
+            error_files.append(error_file)
+        return shard_files, error_files
+
+    def test_merge(self):
+        """The merged results and errors are the ones of a single run."""
+        results_file = self.get_path('results.txt')
+        errors = run_script(
+            'parser.py', self.input_file, results_file, '--memory-budget', '1M'
+        )
+        with open(results_file) as file:
+            results = file.read()
+
+        shard_files, error_files = self.run_shards()
+        merged_file = self.get_path('merged.txt')
+        merged_errors = run_script(
+            'merge.py', merged_file, *shard_files, '--errors', *error_files
+        )
+        with open(merged_file) as file:
+            merged_results = file.read()
+
+        self.assertEqual(merged_results, results)
+        self.assertEqual(merged_errors, errors)
+        # The lines of every kind are in the run
+        self.assertIn('[SIM]', results)
+        self.assertIn('Line rejected', errors)
+        self.assertIn('[S, p#q]', errors)
+
+    def test_missing_shard(self):
+        """The shards of an incomplete run are not merged."""
+        shard_files, _ = self.run_shards()
+        with self.assertRaises(subprocess.CalledProcessError):
+            run_script('merge.py', self.get_path('merged.txt'),
+                       *shard_files[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()